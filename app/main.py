@@ -1,21 +1,100 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from app.routes import example, movie, text_to_speech, generate_ai
-import openai
+from app.utils import whisper_model, job_queue, http_client, llm, workspace, warmup, caption_cache, keywords, metrics, audio_cache, pixabay_cache, upload_store, pcm_audio, scene_manifest
+import asyncio
+import importlib
 import os
 
 load_dotenv()
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
 app = FastAPI(
     title="AI Video Back End Project Python FastAPI",
     description="AI Video Back End Project Python FastAPI",
     version="1.0.0",
 )
 
-app.mount("/public", StaticFiles(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), "temp_videos")), name="public")
+WARMUP_FONT_SIZES = (30,)
+
+_warmup_task = None
+
+metrics.register_stats("tts", audio_cache.stats)
+metrics.register_stats("pixabay", pixabay_cache.stats)
+metrics.register_stats("llm", llm.stats)
+metrics.register_stats("caption", caption_cache.stats)
+metrics.register_stats("pcm", pcm_audio.stats)
+metrics.register_stats("scenes", scene_manifest.stats)
+metrics.register_stats("uploads", upload_store.stats)
+metrics.register_stats("workspace", workspace.stats)
+metrics.register_gauge("job_queue_depth", job_queue.queue_depth)
+
+def warmup_steps() -> list:
+    steps = [
+        ("moviepy", lambda: importlib.import_module("moviepy")),
+        ("whisper", whisper_model.preload_whisper_model),
+        ("fonts", lambda: [caption_cache.get_font(movie.CAPTION_FONT_PATH, font_size) for font_size in WARMUP_FONT_SIZES]),
+        ("keywords", keywords.get_idf_table),
+    ]
+    if movie.get_render_executor() == movie.RENDER_EXECUTOR_PROCESS:
+        # Otherwise The First Renders Pay For Spawning Workers And Importing MoviePy In Each Of Them
+        steps.append(("render_pool", movie.warm_render_pool))
+    return steps
+
+@app.on_event("startup")
+async def start_warmup():
+    # Heavy Modules Are Imported Lazily, So The Server Answers Right Away And /ready Reports When Models And Fonts Are Loaded
+    global _warmup_task
+    if os.getenv("WARMUP", "true").lower() in ("0", "false", "no"):
+        warmup.mark_ready()
+        return
+    _warmup_task = asyncio.create_task(warmup.run(warmup_steps()))
+
+@app.on_event("startup")
+async def collect_workspace_garbage():
+    # Outputs Past The Quota And Scratch Left By A Crashed Run Are Removed Before New Jobs Start
+    await asyncio.to_thread(workspace.collect_garbage)
+
+@app.on_event("startup")
+async def start_job_workers():
+    await job_queue.start_workers(generate_ai.run_generate_ai_job)
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_queue.stop_workers()
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.close_client()
+    await llm.close_client()
+
+@app.on_event("shutdown")
+async def stop_render_pool():
+    movie.shutdown_render_pool()
+
+@app.on_event("shutdown")
+async def flush_audio_cache():
+    await asyncio.to_thread(audio_cache.flush)
+
+@app.get("/health")
+async def health():
+    return { "status": "ok" }
+
+@app.get("/ready")
+async def ready():
+    return JSONResponse(status_code=200 if warmup.is_ready() else 503, content=warmup.status())
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+app.mount("/public", StaticFiles(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), workspace.OUTPUT_DIR)), name="public")
 app.include_router(example.router)
 app.include_router(movie.router)
 app.include_router(text_to_speech.router)
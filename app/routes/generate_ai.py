@@ -1,87 +1,182 @@
-from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException, Depends
 from fastapi.responses import FileResponse
-from moviepy import VideoFileClip, concatenate_videoclips, TextClip, CompositeVideoClip, ImageClip, AudioFileClip, vfx
-from sklearn.feature_extraction.text import TfidfVectorizer
 import random
-from time import time
 from typing import List
 from collections import Counter
+from typing import Callable, Optional
 from . import text_to_speech, generate_video, movie
+from app.utils import job_store, job_queue, pixabay_cache, hls, workspace, keywords, metrics, render_profiles, pcm_audio, scene_manifest
+import asyncio
+import httpx
 import os
 import json
 import re
-import requests
+import uuid
 import logging
-from requests.exceptions import RequestException, HTTPError, Timeout
-import openai
 
 router = APIRouter(prefix="/api/generate-ai", tags=["Generate AI"])
-openai.api_key = os.getenv("OPENAI_API_KEY")
 # Set up logging for better error traceability
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def download_image(image_url: str, sentence_number: int) -> str:
+    # Handling image download with timeout, shared with every job that picked the same hit
+    try:
+        image_path = await pixabay_cache.fetch_asset(image_url, "png", timeout=10)
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to download image: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to download image: {str(e)}")
+    # Success log after image is saved
+    print(f"Image for sentence {sentence_number} successfully generated and saved at {image_path}")
+    return image_path
+
 async def get_pixabay_image(query, each_text_scene, job_id_key):
     """Fetches an image URL from Pixabay based on the given query."""
-    fetched_url = []
     sentences = each_text_scene.split(". ")
     len_sentence = len(sentences)
-    
-    url = f"https://pixabay.com/api/?key={os.getenv('PIXABAY_API_KEY')}&q={query['data']}"
-    current_time = int(time() * 1000)
-    
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if "hits" in data and len(data["hits"]) > 0:
-            hits = data["hits"]
-
-            # Ensure we have enough images for the number of sentences
-            images_to_use = hits[:len_sentence]  # Limit images to the number of sentences
-            if len(images_to_use) == 0:
-                raise HTTPException(status_code=404, detail="No images found for the query")
-            if len(images_to_use) < len(sentences):
-                raise HTTPException(status_code=404, detail="The image length must be the same with sentence length.!!!")
-
-            # Iterate through sentences and pick one image for each sentence
-            for i, img in enumerate(images_to_use):
-                if i < len(images_to_use):  # Only process if there's an image for the sentence
-                    image_url = img.get("webformatURL")
-                    if image_url:
-                        image_path = f"temp_images/{current_time}-{job_id_key}-Sentence-{i + 1}.png"
-                        os.makedirs(os.path.dirname(image_path), exist_ok=True)
-
-                        # Handling image download with retries and timeout
-                        try:
-                            img_response = requests.get(image_url, timeout=10)
-                            img_response.raise_for_status()  # Check for successful response
-                            with open(image_path, "wb") as f:
-                                f.write(img_response.content)
-
-                            # Success log after image is saved
-                            print(f"Image for sentence {i+1} successfully generated and saved at {image_path}")
-                            fetched_url.append(image_path)
-
-                        except (RequestException, HTTPError, Timeout) as e:
-                            logger.error(f"Failed to download image: {e}")
-                            raise HTTPException(status_code=500, detail=f"Failed to download image: {str(e)}")
-
-        return fetched_url  # Return the list of fetched URLs
-
-async def process_scenes(each_text_scene, job_id_key):
+
+    try:
+        data = await pixabay_cache.search(generate_video.PIXABAY_IMAGE_API_URL, query["data"], "photo")
+    except httpx.HTTPError as e:
+        logger.error(f"Pixabay image search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Pixabay image search failed: {str(e)}")
+    if "hits" not in data or len(data["hits"]) == 0:
+        return []
+    hits = data["hits"]
+
+    # Ensure we have enough images for the number of sentences
+    images_to_use = hits[:len_sentence]  # Limit images to the number of sentences
+    if len(images_to_use) < len(sentences):
+        raise HTTPException(status_code=404, detail="The image length must be the same with sentence length.!!!")
+
+    # Download one image for each sentence at the same time
+    downloads = [download_image(img["webformatURL"], i + 1) for i, img in enumerate(images_to_use) if img.get("webformatURL")]
+    return list(await asyncio.gather(*downloads))  # Return the list of fetched URLs
+
+async def process_scenes(each_text_scene, job_id_key, search_query: Optional[str] = None):
     """Processes each scene, extracting sentences, generating image descriptions, and fetching images."""
-    query = await generate_video.acceded_character(each_text_scene)
+    query = { "data": search_query } if search_query else await generate_video.acceded_character(each_text_scene)
     fetched_img_urls = await get_pixabay_image(query, each_text_scene, job_id_key)
     os.makedirs(os.path.dirname("temp_images/"), exist_ok=True)
     return fetched_img_urls
 
-@router.post("")
-async def generate_ai(request: Request, type: str = Form("image"), voice: str=Form(""), prompt_text: str = Form(""), array_text: str = Form(""), duration_total: int = Form(...), duration_per_scene: int = Form(...), orientation: str = Form(...), font_size: int = Form(...), font_color: str = Form(...), transition: str = Form(...)):
+def generate_ai_form(type: str = Form("image"), voice: str=Form(""), prompt_text: str = Form(""), array_text: str = Form(""), duration_total: int = Form(...), duration_per_scene: int = Form(...), orientation: str = Form(...), font_size: int = Form(...), font_color: str = Form(...), transition: str = Form(...), caption_timing: str = Form(text_to_speech.CAPTION_TIMING_WHISPER), render_mode: str = Form(movie.RENDER_MODE_SEGMENTS), render_backend: str = Form(movie.RENDER_BACKEND_MOVIEPY), streaming: bool = Form(False), include_timings: bool = Form(False), render_profile: str = Form(render_profiles.DEFAULT_PROFILE), base_job_id: str = Form("")) -> dict:
     """
     prompt_text => Text Prompt
     duration => Video Duration In Second
-    orientation => Orientation Between Landscape Or Portrait
+    orientation => Orientation Between Landscape, Portrait Or Square, Sets The Frame Size Of The Render Profile
+    caption_timing => "whisper" Or "aligned-from-source" To Time Captions From The Known Sentence Text
+    render_mode => "segments" Renders Each Scene Then Concatenates, "timeline" Encodes The Whole Video Once
+    render_backend => "moviepy" Or "ffmpeg" To Render Image Scenes As One ffmpeg Filtergraph (Segments Mode Only)
+    streaming => Publish Each Finished Scene To An HLS Playlist Under /public/{job_id}/hls (Segments Mode Only)
+    include_timings => Add The Per-Stage And Per-Scene Timing Breakdown Of This Job To The Response
+    render_profile => "draft" (480p, 12 fps, ultrafast) For Quick Previews, "standard" (1080p, 24 fps) Or "final" (1080p, 30 fps, Slow Preset, Low CRF)
+    base_job_id => An Earlier Job To Edit: Only Scenes Whose Text Or Settings Changed Are Rendered Again (Segments Mode Only)
+    """
+    if caption_timing not in text_to_speech.CAPTION_TIMING_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid caption timing. Please use one of {', '.join(text_to_speech.CAPTION_TIMING_MODES)}.")
+    if render_mode not in movie.RENDER_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid render mode. Please use one of {', '.join(movie.RENDER_MODES)}.")
+    if render_backend not in movie.RENDER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Invalid render backend. Please use one of {', '.join(movie.RENDER_BACKENDS)}.")
+    if streaming and render_mode == movie.RENDER_MODE_TIMELINE:
+        raise HTTPException(status_code=400, detail="Streaming needs the segments render mode, the timeline has no finished scene before the end.")
+    try:
+        render_profiles.resolve(render_profile, orientation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if base_job_id and render_mode == movie.RENDER_MODE_TIMELINE:
+        raise HTTPException(status_code=400, detail="Incremental re-render needs the segments render mode, the timeline keeps no scene segments.")
+    if base_job_id and scene_manifest.load(base_job_id) is None:
+        raise HTTPException(status_code=404, detail="Base Job Manifest Not Found")
+    return { "type": type, "voice": voice, "prompt_text": prompt_text, "array_text": array_text, "duration_total": duration_total, "duration_per_scene": duration_per_scene, "orientation": orientation, "font_size": font_size, "font_color": font_color, "transition": transition, "caption_timing": caption_timing, "render_mode": render_mode, "render_backend": render_backend, "streaming": streaming, "include_timings": include_timings, "render_profile": render_profile, "base_job_id": base_job_id }
+
+def write_final_video(all_video_path: List[str], final_output_path: str, profile: dict, all_audio_path: Optional[List[str]] = None):
+    """
+    Concatenate the rendered scene files into the final video. CPU bound, run it in a worker thread.
+    With all_audio_path the narration is muxed from the in-memory PCM samples, the only time the audio is encoded.
     """
+    from moviepy import VideoFileClip, concatenate_videoclips, vfx
+    clips = [VideoFileClip(f, audio=all_audio_path is None).with_effects([vfx.CrossFadeIn(0.5), vfx.FadeOut(0.25)]) for f in all_video_path]  # Convert each file to a clip
+    final_clip = concatenate_videoclips(clips, method="compose")
+    if all_audio_path is not None:
+        final_clip = final_clip.with_audio(movie.narration_track(all_audio_path, [clip.duration for clip in clips]))
+    # final_clip = CompositeVideoClip(clips)
+    final_clip.write_videofile(final_output_path, codec="libx264", audio_codec="aac", **render_profiles.moviepy_params(profile))
+    for clip in clips:
+        clip.close()
+    final_clip.close()
+
+STREAM_DIR = "hls"
+
+def get_scene_network_concurrency() -> int:
+    return max(1, int(os.getenv("SCENE_NETWORK_CONCURRENCY", 8)))
+
+def get_render_concurrency() -> int:
+    return movie.get_render_concurrency()
+
+def pick_video_rendition(videos: dict, width: int, height: int) -> str:
+    """URL of the smallest Pixabay rendition that still covers the frame without upscaling, else the large one."""
+    renditions = sorted((video for video in videos.values() if video.get("url")), key=lambda video: video.get("width", 0) * video.get("height", 0))
+    covering = next((video for video in renditions if video.get("width", 0) >= width and video.get("height", 0) >= height), None)
+    return (covering or videos["large"])["url"]
+
+async def fetch_scene_media(type: str, each_text_scene_index: int, each_text_scene: str, search_query: Optional[str] = None, profile: Optional[dict] = None) -> List[str]:
+    """Fetch the Pixabay video for a video scene, or one image per sentence for an image scene."""
+    profile = profile or render_profiles.resolve()
+    if type == "video":
+        print('this run')
+        all_image_video_path = []
+        # Video Jobs Get Their Queries From The Keyword Index Up Front, Scoring One Scene Is The Fallback
+        join_keyword = search_query or " ".join(keywords.top_terms([each_text_scene])[0])
+        hits = []
+        # Every Term Must Match, So Zero Hits Are Retried With The Lowest Scored Terms Dropped
+        for query in keywords.broaden(join_keyword):
+            data = await pixabay_cache.search(generate_video.PIXABAY_VIDEO_API_URL, query, "video", extra_params={ "video_type": "animation" })
+            hits = data.get("hits") or []
+            if hits:
+                break
+        if not hits:
+            raise HTTPException(status_code=404, detail=f"No Pixabay video found for scene {each_text_scene_index + 1} (query '{join_keyword}')")
+        # Prefer A Clip Of 10 To 20 Seconds, Else Take The Best Match
+        video = next((video for video in hits if 10 <= video.get("duration", 0) <= 20), hits[0])
+        # A Draft Downloads And Decodes A Small Rendition Instead Of Full HD
+        video_url = pick_video_rendition(video["videos"], profile["width"], profile["height"])
+        SAVE_PATH = await pixabay_cache.fetch_asset(video_url, "mp4")
+        all_image_video_path.append(os.path.abspath(SAVE_PATH))
+    else:
+        job_id_key = f"JOB_ID_{each_text_scene_index}"
+        
+        # Get Image in each sentence in One Scene.
+        all_image_video_path = await process_scenes(each_text_scene, job_id_key, search_query)
+    return all_image_video_path
+
+async def run_generate_ai(type: str, voice: str, prompt_text: str, array_text: str, duration_total: int, duration_per_scene: int, orientation: str, font_size: int, font_color: str, transition: str, caption_timing: str, render_mode: str = movie.RENDER_MODE_SEGMENTS, render_backend: str = movie.RENDER_BACKEND_MOVIEPY, streaming: bool = False, render_profile: str = render_profiles.DEFAULT_PROFILE, base_job_id: str = "", job_id: Optional[str] = None, on_progress: Optional[Callable[[str, int, int], None]] = None) -> str:
+    """Run the whole generation pipeline in the job's workspace and return the file name of the final video under /public."""
+    # Make Room Before This Job Adds Its Own Outputs
+    await asyncio.to_thread(workspace.collect_garbage)
+    job_workspace = await asyncio.to_thread(workspace.Workspace, job_id)
+    try:
+        async with metrics.span("job"):
+            return await generate_in_workspace(job_workspace, type, voice, prompt_text, array_text, duration_total, duration_per_scene, orientation, font_size, font_color, transition, caption_timing, render_mode, render_backend, streaming, render_profile, base_job_id, on_progress)
+    finally:
+        pcm_audio.forget(job_workspace.scratch_dir)
+        pcm_audio.forget(job_workspace.output_dir)
+        await asyncio.to_thread(job_workspace.close)
+
+async def generate_in_workspace(job_workspace: workspace.Workspace, type: str, voice: str, prompt_text: str, array_text: str, duration_total: int, duration_per_scene: int, orientation: str, font_size: int, font_color: str, transition: str, caption_timing: str, render_mode: str, render_backend: str, streaming: bool, render_profile: str, base_job_id: str, on_progress: Optional[Callable[[str, int, int], None]]) -> str:
+    try:
+        profile = render_profiles.resolve(render_profile, orientation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def report(stage: str, completed: int = 0, total: int = 0):
+        if on_progress is not None:
+            on_progress(stage, completed, total)
+
+    # The Playlist Exists Before Any Scene Is Ready, So Clients Can Start Polling It Right Away
+    playlist = await asyncio.to_thread(hls.HlsPlaylist, job_workspace.output_path(STREAM_DIR), profile) if streaming else None
+
     max_response_limit = 0
     if (duration_per_scene <= 10):
         max_response_limit = 80
@@ -100,50 +195,81 @@ async def generate_ai(request: Request, type: str = Form("image"), voice: str=Fo
         except:
             raise HTTPException(status_code=500, detail="Array Text Not Valid JSON Format")
     elif prompt_text is not None and prompt_text != "":
+        report("scene_descriptions")
         all_text_scene = await generate_video.generate_scene_descriptions(prompt_text, total_scene, max_response_limit=max_response_limit)
     else:
         raise HTTPException(status_code=500, detail="No Array Text Or Prompt Text Found")
-    # Get Image Or Video From Each Item Of Text Scene
-    clips = []
-    for each_text_scene_index, each_text_scene in enumerate(all_text_scene):
-        all_audio_path = []
-        if type == "video":
-            print('this run')
-            all_image_video_path = []
-            vectorize = TfidfVectorizer(stop_words="english", ngram_range=(1,2))
-            tfidf_matrix = vectorize.fit_transform([each_text_scene])
-            feature_names = vectorize.get_feature_names_out()
-            scores = tfidf_matrix.toarray().sum(axis=0)
-            sorted_keywords = sorted(zip(feature_names, scores), key=lambda x: x[1], reverse=True)
-            """
-            keyword = re.findall(r'\b\w+\b', each_text_scene.lower())
-            """
-            join_keyword = "+".join([word for word, score in sorted_keywords[:5]]) # "+".join([word for word, _ in Counter(keyword).most_common(4)])
-            fetching_url = f"https://pixabay.com/api/videos/?key={os.getenv('PIXABAY_API_KEY')}&q={join_keyword}&video_type=animation"
-            response = requests.get(fetching_url)
-            data = response.json()
-            if "hits" in data and len(data["hits"]) > 0:
-                video_url = next((video for video in data["hits"] if 10 <= video["duration"] <= 20), None)["videos"]["large"]["url"]
-                folder_path = "temp_videos"
-                os.makedirs(folder_path, exist_ok=True)
-                SAVE_PATH = os.path.join(folder_path, f"JOB_ID_{each_text_scene_index}_downloaded_video.mp4")
-                video_response = requests.get(video_url, stream=True)
-                with open(SAVE_PATH, "wb") as file:
-                    for chunk in video_response.iter_content(chunk_size=1024):
-                        file.write(chunk)
-            all_image_video_path.append(os.path.abspath(SAVE_PATH))
-        else:
-            job_id_key = f"JOB_ID_{each_text_scene_index}"
-            
-            # Get Image in each sentence in One Scene.
-            all_image_video_path = await process_scenes(each_text_scene, job_id_key)
-            
-            # Generate Audio in Each sentence in One Scene
-        sentences = each_text_scene.split(". ")
-        all_audio_path = (await text_to_speech.generate_text_to_speech_audio(sentences, voice))["data"]
-        
+    # Scenes Of The Base Job Are Matched By Text, So Inserted Or Reordered Scenes Still Find Theirs, And Edited Ones By Position
+    all_base_scene = scene_manifest.match_scenes(scene_manifest.load(base_job_id) if base_job_id else None, all_text_scene, type)
+    if base_job_id and not any(all_base_scene):
+        logger.warning(f"Manifest of base job {base_job_id} is gone or shares no scene, rendering every scene")
+    # Get The Search Query Of Every Scene Up Front: Keywords For Videos, One LLM Round-Trip For Images
+    # Matched Scenes Keep Their Query, A Fresh Batched Query Could Pick Different Assets
+    all_search_query = [base_scene.get("search_query") if base_scene is not None else None for base_scene in all_base_scene]
+    pending_index = [index for index, search_query in enumerate(all_search_query) if search_query is None]
+    if type == "video":
+        for index, terms in zip(pending_index, keywords.top_terms([all_text_scene[index] for index in pending_index])):
+            all_search_query[index] = " ".join(terms)
+    elif pending_index:
+        report("search_queries")
+        for index, search_query in zip(pending_index, await generate_video.generate_search_queries([all_text_scene[index] for index in pending_index])):
+            all_search_query[index] = search_query
+    scenes_dir = job_workspace.output_path(scene_manifest.SCENES_DIR)
+    os.makedirs(scenes_dir, exist_ok=True)
+    # Process Every Scene Concurrently, Each Stage Bounded By Its Own Limit
+    network_limit = asyncio.Semaphore(get_scene_network_concurrency())
+    transcription_limit = asyncio.Semaphore(1 if caption_timing == text_to_speech.CAPTION_TIMING_WHISPER else get_render_concurrency())
+    stage_completed = Counter()
+
+    def complete_stage(stage: str):
+        stage_completed[stage] += 1
+        report(stage, stage_completed[stage], len(all_text_scene))
+
+    def expected_asset_count(each_text_scene: str) -> int:
+        # A Video Scene Is One Clip, An Image Scene Has One Image Per Sentence
+        return 1 if type == "video" else scene_manifest.sentence_count(each_text_scene)
+
+    async def fetch_or_reuse_media(each_text_scene_index: int, each_text_scene: str, base_scene: Optional[dict]) -> List[str]:
+        # Downloaded Assets Stay In The Pixabay Cache, Videos Only Match When They Were Picked For The Same Frame Size
+        if base_scene is not None and len(base_scene["assets"]) == expected_asset_count(each_text_scene) and all(os.path.exists(asset_path) for asset_path in base_scene["assets"]) and (type != "video" or base_scene["frame"] == [profile["width"], profile["height"]]):
+            scene_manifest.stats["assets_reused"] += 1
+            return list(base_scene["assets"])
+        return await fetch_scene_media(type, each_text_scene_index, each_text_scene, all_search_query[each_text_scene_index], profile)
+
+    async def publish(each_text_scene_index: int, all_video_path: List[str]):
+        if playlist is not None:
+            async with metrics.span("publish"):
+                await asyncio.to_thread(playlist.add_scene, each_text_scene_index, all_video_path)
+            complete_stage("published")
+
+    async def process_scene(each_text_scene_index: int, each_text_scene: str):
+        # Every Scene Runs In Its Own Task, So The Scene Tag Only Applies To This Scene's Spans
+        metrics.set_scene(each_text_scene_index)
+        base_scene = all_base_scene[each_text_scene_index]
+        # Everything That Changes The Rendered Segment Besides The Assets, Which Are Only Known After The Search
+        scene_fields = { "text": each_text_scene, "type": type, "voice": voice, "font_size": font_size, "font_color": font_color, "caption_timing": caption_timing, "profile": profile, "render_backend": render_backend, "scene_audio": streaming }
+        if render_mode == movie.RENDER_MODE_SEGMENTS and base_scene is not None and base_scene["hash"] == scene_manifest.scene_hash(**scene_fields, assets=base_scene["asset_ids"]):
+            scene = await asyncio.to_thread(scene_manifest.reuse_scene, base_scene, base_job_id, scenes_dir)
+            if scene is not None:
+                for stage in ("assets", "transcription", "render"):
+                    complete_stage(stage)
+                all_video_path = [os.path.join(scenes_dir, file_name) for file_name in scene["videos"]]
+                await publish(each_text_scene_index, all_video_path)
+                return scene, all_video_path, [os.path.join(scenes_dir, file_name) for file_name in scene["audios"]]
+        # Get Image Or Video And Audio For Each Sentence In One Scene
+        async with network_limit:
+            sentences = each_text_scene.split(". ")
+            all_image_video_path, all_audio_path = await asyncio.gather(
+                fetch_or_reuse_media(each_text_scene_index, each_text_scene, base_scene),
+                text_to_speech.generate_text_to_speech_audio(sentences, voice, job_workspace.scratch("audios")),
+            )
+            all_audio_path = all_audio_path["data"]
+        complete_stage("assets")
+
         # Generate Audio Text Transcribe
-        all_scene_text_transcription = (await text_to_speech.generate_timestamp_from_audio(all_audio_path))["data"]
+        async with transcription_limit, metrics.span("transcription"):
+            all_scene_text_transcription = (await text_to_speech.generate_timestamp_for_job([all_audio_path], [sentences], caption_timing))["data"][0]
+        complete_stage("transcription")
         """
             total_scene = 6
             all_text_scene = [
@@ -179,18 +305,149 @@ async def generate_ai(request: Request, type: str = Form("image"), voice: str=Fo
                 { "segments": [{ "start": 0, "end": 14, "text": all_text_scene[5] }] },
             ]
             """
-        # Generate Video Each Scene
-        all_video_path = (await movie.combine_video_and_audio(target_width=1920, target_height=1080, type=type, duration_per_scene=duration_per_scene, total_scene=total_scene, all_image_video_path=all_image_video_path, all_audio_path=all_audio_path,all_scene_text_transcription=all_scene_text_transcription, font_size=font_size, font_color=font_color))
-        scene_clips = [VideoFileClip(f).with_effects([vfx.CrossFadeIn(0.5), vfx.FadeOut(0.25)]) for f in all_video_path]  # Convert each file to a clip
-        clips.extend(scene_clips)  # Store clips properly
-    final_clip = concatenate_videoclips(clips, method="compose")
-    # final_clip = CompositeVideoClip(clips)
-    current_time = int(time() * 1000)
-    temp_dir = "temp_videos"
-    os.makedirs(temp_dir, exist_ok=True)
-    final_output_path = os.path.join(temp_dir, f"{current_time}-final_concatenated_output.mp4")
-    final_clip.write_videofile(final_output_path, codec="libx264", audio_codec="aac", fps=24)
-    for clip in clips:
-        clip.close()
-    final_clip.close()
-    return { "data": f"{str(request.base_url).rstrip('/')}/public/{current_time}-final_concatenated_output.mp4" }
+        if render_mode == movie.RENDER_MODE_TIMELINE:
+            # The Timeline Is Composed And Encoded Once After Every Scene Is Ready
+            return [
+                (profile["width"], profile["height"], type, each_image_video_path, all_audio_path[each_image_video_path_index], all_scene_text_transcription[each_image_video_path_index], font_size, font_color)
+                for each_image_video_path_index, each_image_video_path in enumerate(all_image_video_path)
+            ]
+        # Generate Video Each Scene, Encodes Are Bounded By The Shared Render Limit In movie
+        all_video_path = await movie.combine_video_and_audio(target_width=profile["width"], target_height=profile["height"], type=type, duration_per_scene=duration_per_scene, total_scene=total_scene, all_image_video_path=all_image_video_path, all_audio_path=all_audio_path,all_scene_text_transcription=all_scene_text_transcription, font_size=font_size, font_color=font_color, backend=render_backend, output_dir=scenes_dir, profile=profile, include_audio=streaming)
+        complete_stage("render")
+        await publish(each_text_scene_index, all_video_path)
+        # Narration Sits Beside The Segments, A Follow-Up Job Muxes It Again Without Synthesizing It
+        if type == "video":
+            # The Single Video Clip Is Narrated By The First Sentence Only, As It Always Was
+            all_audio_path = all_audio_path[:1]
+        if len(all_audio_path) != len(all_video_path):
+            raise RuntimeError(f"Scene {each_text_scene_index} rendered {len(all_video_path)} clips for {len(all_audio_path)} narrated sentences")
+        await asyncio.to_thread(lambda: [scene_manifest.link_file(audio_path, os.path.join(scenes_dir, os.path.basename(audio_path))) for audio_path in all_audio_path])
+        scene_manifest.stats["misses"] += 1
+        asset_ids = [os.path.basename(asset_path) for asset_path in all_image_video_path]
+        scene = {
+            "text": each_text_scene,
+            "hash": scene_manifest.scene_hash(**scene_fields, assets=asset_ids),
+            "search_query": all_search_query[each_text_scene_index],
+            "assets": [os.path.abspath(asset_path) for asset_path in all_image_video_path],
+            "asset_ids": asset_ids,
+            "frame": [profile["width"], profile["height"]],
+            "videos": [os.path.basename(video_path) for video_path in all_video_path],
+            "audios": [os.path.basename(audio_path) for audio_path in all_audio_path],
+        }
+        # The Final Mux Reads This Job's Narration From Memory Under Its Scratch Name
+        return scene, all_video_path, all_audio_path
+
+    # gather Keeps Scene Order, So The Clip List Matches The Order Of The Text Scenes
+    all_scene_result = await asyncio.gather(*[process_scene(index, text_scene) for index, text_scene in enumerate(all_text_scene)])
+    if playlist is not None:
+        await asyncio.to_thread(playlist.finish)
+    final_output_name = "final_concatenated_output.mp4"
+    if render_mode == movie.RENDER_MODE_TIMELINE:
+        all_scene_clip_args = [scene_clip_args for scene_result in all_scene_result for scene_clip_args in scene_result]
+        report("render", 0, len(all_text_scene))
+        # One Encode Of The Whole Job, Queued Behind The Same Render Limit And Executor As Scene Encodes
+        async with metrics.span("timeline_render"):
+            await movie.run_render_limited(movie.render_timeline, all_scene_clip_args, job_workspace.output_path(final_output_name), profile)
+        return job_workspace.public_name(final_output_name)
+    report("concatenate", len(all_text_scene), len(all_text_scene))
+    all_video_path = [video_path for _, scene_video_path, _ in all_scene_result for video_path in scene_video_path]
+    all_audio_path = [audio_path for _, _, scene_audio_path in all_scene_result for audio_path in scene_audio_path]
+    async with metrics.span("concatenate"):
+        await asyncio.to_thread(write_final_video, all_video_path, job_workspace.output_path(final_output_name), profile, all_audio_path)
+    # Written Last, A Manifest Only Exists For A Job Whose Scenes Are All Complete
+    await asyncio.to_thread(scene_manifest.write, job_workspace.id, {
+        "type": type,
+        "render_profile": render_profile,
+        "orientation": orientation,
+        "base_job_id": base_job_id or None,
+        "final": final_output_name,
+        "scenes": [scene for scene, _, _ in all_scene_result],
+    })
+    return job_workspace.public_name(final_output_name)
+
+def public_url(base_url: str, file_name: str) -> str:
+    return f"{base_url.rstrip('/')}/public/{file_name}"
+
+def stream_playlist_name(job_id: str) -> str:
+    return f"{job_id}/{STREAM_DIR}/{hls.PLAYLIST_NAME}"
+
+@router.post("")
+async def generate_ai(request: Request, params: dict = Depends(generate_ai_form)):
+    job_id = uuid.uuid4().hex
+    params = dict(params)
+    include_timings = params.pop("include_timings")
+    with metrics.job_context(job_id) as timings:
+        final_output_name = await run_generate_ai(**params, job_id=job_id)
+    response = { "data": public_url(str(request.base_url), final_output_name) }
+    if params["streaming"]:
+        response["playlist"] = public_url(str(request.base_url), stream_playlist_name(job_id))
+    if include_timings:
+        response["timings"] = timings
+    return response
+
+async def run_generate_ai_job(job: dict):
+    """Worker handler: run a queued job and persist its stage progress and result."""
+    job_id = job["id"]
+    params = dict(job["params"])
+    base_url = params.pop("base_url")
+    # Jobs Persisted Before Timings Existed Have No Such Parameter
+    include_timings = params.pop("include_timings", False)
+
+    def on_progress(stage: str, completed: int, total: int):
+        job_store.update_job(job_id, stage=stage, completed=completed, total=total)
+
+    with metrics.job_context(job_id) as timings:
+        try:
+            final_output_name = await run_generate_ai(**params, job_id=job_id, on_progress=on_progress)
+        except HTTPException as e:
+            job_store.update_job(job_id, status=job_store.JOB_STATUS_FAILED, stage=job_store.JOB_STATUS_FAILED, error=e.detail, timings=timings if include_timings else None)
+            return
+    job_store.update_job(job_id, status=job_store.JOB_STATUS_COMPLETED, stage=job_store.JOB_STATUS_COMPLETED, result=public_url(base_url, final_output_name), timings=timings if include_timings else None)
+
+def job_response(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "completed": job["completed"],
+        "total": job["total"],
+        "queue_position": job_queue.queue_position(job["id"]),
+        "result": job["result"],
+        "playlist": job.get("playlist"),
+        "timings": job.get("timings"),
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+@router.post("/jobs")
+async def submit_generate_ai_job(request: Request, params: dict = Depends(generate_ai_form)):
+    """Queue a generation job and return immediately with its id and queue position."""
+    job = job_store.create_job({ **params, "base_url": str(request.base_url) })
+    if params["streaming"]:
+        # Playback Can Start From This URL As Soon As The First Scene Is Published
+        job = job_store.update_job(job["id"], playlist=public_url(str(request.base_url), stream_playlist_name(job["id"])))
+    try:
+        job_queue.submit(job["id"])
+    except job_queue.QueueFullError as e:
+        job_store.update_job(job["id"], status=job_store.JOB_STATUS_FAILED, stage=job_store.JOB_STATUS_FAILED, error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    return { "data": job_response(job) }
+
+@router.get("/jobs/{job_id}")
+async def get_generate_ai_job(job_id: str):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job Not Found")
+    return { "data": job_response(job) }
+
+@router.get("/jobs/{job_id}/result")
+async def get_generate_ai_job_result(job_id: str):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job Not Found")
+    if job["status"] == job_store.JOB_STATUS_FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != job_store.JOB_STATUS_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job Is Still {job['status'].title()}")
+    return { "data": job["result"] }
@@ -1,12 +1,13 @@
 import os
-import openai
-import requests
+import json
+import asyncio
+import httpx
 import ffmpeg
 import logging
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, APIRouter
-from typing import List, Tuple
-from requests.exceptions import RequestException, HTTPError, Timeout
+from typing import List, Optional, Tuple
+from app.utils import pixabay_cache, llm
 
 load_dotenv()
 
@@ -19,9 +20,12 @@ BACKGROUND_WIDTH = 1920
 BACKGROUND_HEIGHT = 1080
 NUM_SCENES = 5
 MAX_RESPONSE_LENGTH = 100
+LLM_MODEL = "gpt-4o-mini"
+PIXABAY_API_BASE_URL = os.getenv("PIXABAY_API_BASE_URL", "https://pixabay.com/api").rstrip("/")
+PIXABAY_IMAGE_API_URL = f"{PIXABAY_API_BASE_URL}/"
+PIXABAY_VIDEO_API_URL = f"{PIXABAY_API_BASE_URL}/videos/"
 
 # OpenAI and API Key Configurations
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,17 +37,14 @@ router = APIRouter(prefix="/video", tags=["Video"])
 async def generate_scene_descriptions(prompt: str, num_scenes: int = NUM_SCENES, max_response_limit: int = MAX_RESPONSE_LENGTH) -> List[str]:
     """Generate scene descriptions using OpenAI."""
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
+        # Identical prompts are answered from the persistent LLM cache
+        content = await llm.chat_completion(
+            model=LLM_MODEL,
             messages= [
                 {"role": "developer", "content": [{"type": "text", "text": "You are a creative screenwriter that writes description about scenes based on prompts keyword from user.  Limit each scene description to {max_response_limit} characters"}]},
                 {"role": "user", "content": [{"type": "text", "text": f"Write {num_scenes} short scene descriptions for: {prompt}"}]}
             ],
         )
-
-         # Extract content from the first choice
-        # logger.info(f"OpenAI Response: {response}")
-        content = response.choices[0].message.content
         logger.info(f"OpenAI Response Content: {content}")
 
         # Split the content into individual scenes (assuming double newlines separate scenes)
@@ -96,14 +97,44 @@ async def generate_scene_descriptions(prompt: str, num_scenes: int = NUM_SCENES,
 #         raise HTTPException(status_code=500, detail=f"Image generation failed: {str(e)}")
 
 async def acceded_character(scene:str) -> str:
-    response = openai.chat.completions.create(
-        model="gpt-4o-mini",
+    content = await llm.chat_completion(
+        model=LLM_MODEL,
         messages= [
             {"role": "system", "content": [{"type": "text", "text": "You are an AI that extracts the main text from scene descriptions for image search. The main text may exceed in below 30 characters."}]},
             {"role": "user", "content": [{"type": "text", "text": f"{scene}"}]}
         ],
     )
-    return { 'data': response.choices[0].message.content or "" }
+    return { 'data': content }
+
+def parse_search_queries(content: str, count: int) -> Optional[List[str]]:
+    """The queries of a batched reply, or None when it is not the JSON object asked for or holds the wrong number of them."""
+    try:
+        queries = [str(query) for query in json.loads(content)["queries"]]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+    return queries if len(queries) == count else None
+
+async def generate_search_queries(scenes: List[str]) -> List[str]:
+    """Extract the image-search query of every scene of a job in one structured LLM call."""
+    if not scenes:
+        return []
+    numbered_scenes = "\n".join(f"{index + 1}. {scene}" for index, scene in enumerate(scenes))
+    content = await llm.chat_completion(
+        model=LLM_MODEL,
+        # An Invalid Reply Is Never Cached, The Next Job With These Scenes Asks Again
+        validate=lambda content: parse_search_queries(content, len(scenes)) is not None,
+        response_format={"type": "json_object"},
+        messages= [
+            {"role": "system", "content": [{"type": "text", "text": "You are an AI that extracts the main text from scene descriptions for image search. The main text may exceed in below 30 characters. Reply with a JSON object {\"queries\": [...]} holding exactly one query per numbered scene, in the same order."}]},
+            {"role": "user", "content": [{"type": "text", "text": numbered_scenes}]}
+        ],
+    )
+    queries = parse_search_queries(content, len(scenes))
+    if queries is None:
+        # Fall Back To One Call Per Scene Rather Than Pairing Queries With The Wrong Scenes
+        logger.error(f"Batched search query extraction returned an invalid reply for {len(scenes)} scenes")
+        queries = [result["data"] for result in await asyncio.gather(*[acceded_character(scene) for scene in scenes])]
+    return queries
 
 # @router.post("/generate-image")
 # async def generate_images_from_scenes(scene: str, job_id: str, orientation: str = "portrait") -> str:
@@ -189,30 +220,23 @@ async def generate_images_from_scenes(scene: str, job_id: str, orientation: str
         # ))
         # Generate the image with Pixabay
         summarize_scene = await acceded_character(scene)
-        fetching_url = f"https://pixabay.com/api/?key={os.getenv('PIXABAY_API_KEY')}&q={summarize_scene['data']}&orientation={image_size}"
 
         # Fetch the data from Pixabay API
-        response = requests.get(fetching_url)
-        data = response.json()
+        data = await pixabay_cache.search(PIXABAY_IMAGE_API_URL, summarize_scene["data"], "photo", orientation=image_size)
         if "hits" in data and len(data["hits"]) > 0:
             first_item = next(iter(data["hits"]), None)  # Get the first item safely
             if first_item:  # Ensure it's not None
                 image_url = first_item.get("webformatURL")
-                image_path = f"temp_images/{job_id}_scene.png"
-                os.makedirs(os.path.dirname(image_path), exist_ok=True)
 
-                # Handling image download with retries and timeout
+                # Handling image download with timeout, stored once per URL and shared across jobs
                 try:
-                    img_response = requests.get(image_url, timeout=10)
-                    img_response.raise_for_status()  # Check for successful response
-                    with open(image_path, "wb") as f:
-                        f.write(img_response.content)
+                    image_path = await pixabay_cache.fetch_asset(image_url, "png", timeout=10)
 
                     # Success log after image is saved
                     logger.info(f"Image successfully generated and saved at {image_path}")
                     print(f"Image successfully generated and saved at {image_path}")  # Optionally print to the console
 
-                except (RequestException, HTTPError, Timeout) as e:
+                except httpx.HTTPError as e:
                     logger.error(f"Failed to download image: {e}")
                     raise HTTPException(status_code=500, detail=f"Failed to download image: {str(e)}")
 
@@ -1,62 +1,124 @@
 import os
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import FileResponse
-from moviepy import VideoFileClip, concatenate_videoclips, TextClip, CompositeVideoClip, ImageClip, AudioFileClip, vfx
-from moviepy.video.fx import CrossFadeIn
-from PIL import Image, ImageDraw, ImageFont
-from time import time
-from typing import List
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 from . import text_to_speech
+from app.utils import caption_cache, ken_burns, ffmpeg_scene, workspace, upload_store, metrics, render_profiles, pcm_audio
 import numpy as np
+import asyncio
+import importlib
+import multiprocessing
 import os
-import shutil
 import uuid
 
+CAPTION_FONT_PATH = os.path.join(os.getcwd(), "src", "fonts", "TypeLightSans-KV84p.otf")
+
 router = APIRouter(
     prefix="/movie",
     tags=["Movie"],
 )
 
+async def ingest_upload(upload: UploadFile) -> str:
+    """Stream an upload into the upload store and return its path, rejecting anything ffprobe cannot read as a video."""
+    try:
+        return (await upload_store.ingest(upload))["path"]
+    except upload_store.UploadRejectedError as e:
+        raise HTTPException(status_code=e.status_code, detail=f"{upload.filename}: {e}")
+
+async def ingest_uploads(uploads: List[UploadFile]) -> List[str]:
+    """Ingest every upload, or none: when one is rejected the others are released again before the error is raised."""
+    results = await asyncio.gather(*[ingest_upload(upload) for upload in uploads], return_exceptions=True)
+    error = next((result for result in results if isinstance(result, BaseException)), None)
+    if error is not None:
+        upload_store.release([result for result in results if isinstance(result, str)])
+        raise error
+    return list(results)
+
+@asynccontextmanager
+async def request_workspace():
+    """A workspace per /movie request, like a generate-ai job: narration and item clips go to its scratch, the result to its output."""
+    # Make Room Before This Request Adds Its Own Outputs
+    await asyncio.to_thread(workspace.collect_garbage)
+    movie_workspace = await asyncio.to_thread(workspace.Workspace)
+    try:
+        yield movie_workspace
+    finally:
+        pcm_audio.forget(movie_workspace.scratch_dir)
+        await asyncio.to_thread(movie_workspace.close)
+
 @router.post("/combine-video-and-audio")
-async def movie_combination(file1: UploadFile = File(...), file2: UploadFile = File(...), text: str = Form(...)):
-    return FileResponse(await combine_video_and_audio(file1, file2, text), media_type="video/mp4", filename="final_output.mp4")
+async def movie_combination(file1: UploadFile = File(...), file2: UploadFile = File(...), text: str = Form(...), voice: str = Form(text_to_speech.TTS_DEFAULT_VOICE)):
+    all_path = await ingest_uploads([file1, file2])
+    try:
+        async with request_workspace() as movie_workspace:
+            output_path = await combine_uploaded_video_and_audio(*all_path, text, movie_workspace, voice)
+    finally:
+        upload_store.release(all_path)
+    return FileResponse(output_path, media_type="video/mp4", filename="final_output.mp4")
 
 @router.post("/combine-video-and-audio-multiple-concatenate")
-async def movie_combination_multiple(file1: List[UploadFile] = File(...), file2: List[UploadFile] = File(...), text: List[str] = Form(...)):
+async def movie_combination_multiple(file1: List[UploadFile] = File(...), file2: List[UploadFile] = File(...), text: List[str] = Form(...), voice: str = Form(text_to_speech.TTS_DEFAULT_VOICE)):
     if not (len(file1) == len(file2) == len(text)):
         return { "data": "" }
-    all_video = [await combine_video_and_audio(item_file1, item_file2, item_text) for item_file1, item_file2, item_text in zip(file1, file2, text)]
-    return FileResponse(await concatenate_video(all_video), media_type="video/mp4", filename="concatenated_output.mp4")
+    # Every Upload Is Validated Before Any Of Them Is Decoded
+    all_path = await ingest_uploads([*file1, *file2])
+    all_file1_path, all_file2_path = all_path[:len(file1)], all_path[len(file1):]
+    try:
+        async with request_workspace() as movie_workspace:
+            all_video = await combine_uploaded_items(all_file1_path, all_file2_path, text, movie_workspace, voice)
+            output_path = await concatenate_video(all_video, movie_workspace.output_path("concatenated_output.mp4"))
+    finally:
+        upload_store.release(all_path)
+    return FileResponse(output_path, media_type="video/mp4", filename="concatenated_output.mp4")
+
+def write_concatenated_video(file: List[str], output_path: str) -> str:
+    from moviepy import VideoFileClip, concatenate_videoclips
+    from moviepy.video.fx import CrossFadeIn
+    clips = [VideoFileClip(f) for f in file]
+    clips_with_transitions = [clips[i].with_effects([CrossFadeIn((1.0))]) if i > 0 else clips[i] for i in range(len(clips))]
+    final_clip = concatenate_videoclips(clips_with_transitions, method="compose")
+    final_clip.write_videofile(output_path, codec="libx264")
+    for clip in clips:
+        clip.close()
+    final_clip.close()
+    return output_path
 
-async def concatenate_video(file: List[str]):
+async def concatenate_video(file: List[str], output_path: str):
     try:
-        clips = [VideoFileClip(f) for f in file]
-        clips_with_transitions = [clips[i].with_effects([CrossFadeIn((1.0))]) if i > 0 else clips[i] for i in range(len(clips))]
-        final_clip = concatenate_videoclips(clips_with_transitions, method="compose")
-        current_time = int(time() * 1000)
-        temp_dir = "temp_videos"
-        os.makedirs(temp_dir, exist_ok=True)
-        output_path = os.path.join(temp_dir, f"{current_time}-final_concatenated_output.mp4")
-        final_clip.write_videofile(output_path, codec="libx264")
-        for clip in clips:
-            clip.close()
-        final_clip.close()
-        return output_path
+        return await asyncio.to_thread(write_concatenated_video, file, output_path)
     except Exception as e:
         print(f"An Error Occurred: {e}")
         return { "data": "" }
 
-async def combine_video_and_audio(file1: UploadFile = File(...), file2: UploadFile = File(...), text: str = Form(...)):
-    # Make Temporary Directory And Save The Video File
-    current_time = int(time() * 1000)
-    temp_dir = "temp_videos"
-    os.makedirs(temp_dir, exist_ok=True)
-    file1_path = os.path.join(temp_dir, f"{uuid.uuid4()}_{file1.filename}")
-    file2_path = os.path.join(temp_dir, f"{uuid.uuid4()}_{file2.filename}")
-    with open(file1_path, "wb") as buffer:
-        shutil.copyfileobj(file1.file, buffer)
-    with open(file2_path, "wb") as buffer:
-        shutil.copyfileobj(file2.file, buffer)
+async def narrate_items(texts: List[str], voice: str, audio_dir: str) -> tuple:
+    """Synthesize every item's narration concurrently, then time all captions in one transcription call."""
+    all_audios = await asyncio.gather(*[text_to_speech.generate_text_to_speech_audio([text], voice, audio_dir) for text in texts])
+    all_audio_path = [audios["data"][0] if audios["data"] else None for audios in all_audios]
+    if None in all_audio_path:
+        raise HTTPException(status_code=502, detail="Text To Speech Failed For At Least One Item")
+    transcriptions = await text_to_speech.generate_timestamp_from_audio(all_audio_path)
+    return all_audio_path, transcriptions["data"]
+
+async def combine_uploaded_video_and_audio(file1_path: str, file2_path: str, text: str, movie_workspace: workspace.Workspace, voice: str = text_to_speech.TTS_DEFAULT_VOICE, executor: Optional[str] = None) -> str:
+    """Overlay the second ingested video on the first with narrated captions. Inputs live in the shared upload store and are left in place."""
+    (audio_path,), (transcription,) = await narrate_items([text], voice, movie_workspace.scratch("audios"))
+    return await run_render_limited(render_uploaded_item, file1_path, file2_path, audio_path, transcription, movie_workspace.output_path("final_output.mp4"), executor=executor)
+
+async def combine_uploaded_items(all_file1_path: List[str], all_file2_path: List[str], texts: List[str], movie_workspace: workspace.Workspace, voice: str = text_to_speech.TTS_DEFAULT_VOICE, executor: Optional[str] = None) -> List[str]:
+    """Narrate every item up front, then render the items in parallel under the shared render limit into scratch. Keeps item order."""
+    all_audio_path, all_transcription = await narrate_items(texts, voice, movie_workspace.scratch("audios"))
+    items_dir = movie_workspace.scratch("items")
+    all_video_path = await asyncio.gather(*[
+        run_render_limited(render_uploaded_item, file1_path, file2_path, audio_path, transcription, os.path.join(items_dir, f"{index}-item.mp4"), executor=executor)
+        for index, (file1_path, file2_path, audio_path, transcription) in enumerate(zip(all_file1_path, all_file2_path, all_audio_path, all_transcription))
+    ])
+    return list(all_video_path)
+
+def render_uploaded_item(file1_path: str, file2_path: str, audio_path: str, transcription: dict, output_path: str) -> str:
+    """Compose and encode one /movie item to output_path. CPU bound, never call it on the event loop."""
+    from moviepy import VideoFileClip, CompositeVideoClip, ImageClip
     # Process The Video
     videoClip1 = VideoFileClip(file1_path)
     videoClip2 = VideoFileClip(file2_path)
@@ -65,22 +127,19 @@ async def combine_video_and_audio(file1: UploadFile = File(...), file2: UploadFi
     padding = 50
     total_width = videoClip1.size[0]
     video_width = videoClip2.resized(height=200).size[0]
-    # Generate Audio From Text
-    audios = await text_to_speech.generate_text_to_speech_audio([text])
-    transcriptions = await text_to_speech.generate_timestamp_from_audio(audios.get("data", []))
-    audioClip1 = AudioFileClip(audios.get("data", [])[0])
+    audioClip1 = load_audio_clip(audio_path)
     videoClip1 = videoClip1.with_audio(audioClip1)
     # Add Text And Background Array Clip
     text_width = 400
     radius = 20
     all_text_clip = []
     all_background_clip = []
-    for transcribe in transcriptions["data"][0]["segments"]:
+    for transcribe in transcription["segments"]:
         start_time = transcribe["start"]
         end_time = transcribe["end"]
         text_segmented = transcribe["text"]
         # Add Text Overlay
-        text_overlay = TextClip(font=font_path, text=text_segmented, font_size=30, size=(text_width - 20, None), color="white", method="caption", text_align="right")
+        text_overlay = ImageClip(caption_cache.get_caption(text_segmented, CAPTION_FONT_PATH, 30, "white", text_width - 20, "right"), transparent=True)
         text_overlay = text_overlay.with_position((total_width - padding - text_width + 10, "center"))
         """
         text_overlay = text_overlay.with_duration(videoClip1.duration)
@@ -102,63 +161,185 @@ async def combine_video_and_audio(file1: UploadFile = File(...), file2: UploadFi
     videoClip2_resized = videoClip2.resized(height=200).with_position((padding, "center"))
     result = CompositeVideoClip([videoClip1, videoClip2_resized, *all_background_clip, *all_text_clip], size=videoClip1.size)
     # Save The Final Video
-    output_path = os.path.join(temp_dir, f"{current_time}-final_output.mp4")
     result.write_videofile(output_path, codec="libx264", audio_codec="aac")
     # Clean Up Temporary File
     videoClip1.close()
     videoClip2.close()
+    audioClip1.close()
     result.close()
-    os.remove(file1_path)
-    os.remove(file2_path)
     return output_path
 
 def create_rounded_background(width, height, radius, color):
-    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    draw.rounded_rectangle([(0, 0), (width, height)], radius=radius, fill=color)
-    return np.array(img)
-
-async def combine_video_and_audio(target_width: int, target_height: int,type: str, duration_per_scene: int, total_scene: int, all_image_video_path: List[str], all_audio_path: List[str], all_scene_text_transcription: list, font_size: int = 30, font_color: str = "white"):
-    all_video_path = []
-    for each_image_video_path_index, each_image_video_path in enumerate(all_image_video_path):
-        image_video_clip = VideoFileClip(each_image_video_path) if type == "video" else ImageClip(each_image_video_path)
-        audio_clip = AudioFileClip(all_audio_path[each_image_video_path_index])
-        image_video_clip = image_video_clip.with_duration(max(audio_clip.duration) if type == "video" else audio_clip.duration)
-        image_video_clip = image_video_clip.with_audio(audio_clip)
+    return caption_cache.get_rounded_background(width, height, radius, tuple(color))
+
+def load_audio_clip(audio_path: str):
+    """An array-backed clip of the narration's in-memory PCM samples, so MoviePy never decodes the audio file."""
+    from moviepy.audio.AudioClip import AudioArrayClip
+    samples, sample_rate = pcm_audio.load(audio_path)
+    # Written As Two Channels, AudioArrayClip Builds Stereo Frames When Sampling Many Times At Once
+    return AudioArrayClip(np.column_stack([samples, samples]), fps=sample_rate)
+
+def narration_track(all_audio_path: List[str], all_duration: List[float]):
+    """One array-backed audio clip of every narration in order, each trimmed or padded to the duration of its rendered clip."""
+    from moviepy.audio.AudioClip import AudioArrayClip
+    sample_rate = pcm_audio.load(all_audio_path[0])[1]
+    samples = np.concatenate([
+        pcm_audio.fit_length(pcm_audio.load_resampled(audio_path, sample_rate), round(duration * sample_rate))
+        for audio_path, duration in zip(all_audio_path, all_duration)
+    ])
+    return AudioArrayClip(np.column_stack([samples, samples]), fps=sample_rate)
+
+def build_scene_clip(target_width: int, target_height: int, type: str, image_video_path: str, audio_path: str, scene_text_transcription: dict, font_size: int = 30, font_color: str = "white"):
+    """Compose one sentence clip with its captions without rendering it. Returns the composite and the clips to close after writing."""
+    from moviepy import VideoFileClip, CompositeVideoClip, ImageClip
+    audio_clip = load_audio_clip(audio_path)
+    if type == "video":
+        image_video_clip = VideoFileClip(image_video_path)
+        image_video_clip = image_video_clip.with_duration(audio_clip.duration)
         scale_factor = max(target_width / image_video_clip.w, target_height / image_video_clip.h)
         image_video_clip = image_video_clip.resized(scale_factor)
         image_video_clip = image_video_clip.resized(lambda t: 1 + 0.02 * t)
         image_video_clip = image_video_clip.cropped(x_center=image_video_clip.w // 2, y_center=image_video_clip.h // 2, width=target_width, height=target_height)
-        all_text_clip = []
-        all_text_background_clip = []
-        for transcribe in all_scene_text_transcription[each_image_video_path_index]["segments"]:
-            start_time = transcribe["start"]
-            end_time = transcribe["end"]
-            text_segmented = transcribe["text"]
-            text_overlay = TextClip(font=os.path.join(os.getcwd(), "src", "fonts", "TypeLightSans-KV84p.otf"), text=text_segmented, font_size=font_size, size=(380, None), color=font_color, method="caption", text_align="center")
-            text_overlay = text_overlay.with_position(("center", image_video_clip.size[1] - text_overlay.size[1] - 40 + 15))
-            text_overlay = text_overlay.with_start(start_time)
-            text_overlay = text_overlay.with_end(end_time)
-            all_text_clip.append(text_overlay)
-            text_height = text_overlay.size[1]
-            background_image = create_rounded_background(400, text_height + 40, 20, color=(0, 0, 0, 192))
-            background_clip = ImageClip(background_image).with_position(("center", image_video_clip.size[1] - text_overlay.size[1] - 40 - 10))
-            background_clip = background_clip.with_start(start_time)
-            background_clip = background_clip.with_end(end_time)
-            all_text_background_clip.append(background_clip)
-        result = CompositeVideoClip([image_video_clip, *all_text_background_clip, *all_text_clip], size=image_video_clip.size)
-        # Save Video To Storage
-        temp_dir = "temp_videos"
-        os.makedirs(temp_dir, exist_ok=True)
-        current_time = int(time() * 1000)
-        output_path = os.path.join(temp_dir, f"{current_time}-final_scene_output.mp4")
-        result.write_videofile(output_path, codec="libx264", audio_codec="aac", fps=24)
-        image_video_clip.close()
-        audio_clip.close()
-        for each_text_clip in all_text_clip:
-            each_text_clip.close()
-        for each_text_background_clip in all_text_background_clip:
-            each_text_background_clip.close()
-        result.close()
-        all_video_path.append(output_path)
-    return all_video_path
+    else:
+        # Zoom Only Samples The Visible Box Each Frame Instead Of Resizing The Whole Oversized Image
+        image_video_clip = ken_burns.ken_burns_clip(image_video_path, target_width, target_height, audio_clip.duration)
+    image_video_clip = image_video_clip.with_audio(audio_clip)
+    # Captions Keep Their Size Relative To The Frame, So A Draft Shows The Same Layout As The Final Render
+    scale = render_profiles.caption_scale(target_width, target_height)
+    all_text_clip = []
+    all_text_background_clip = []
+    for transcribe in scene_text_transcription["segments"]:
+        start_time = transcribe["start"]
+        end_time = transcribe["end"]
+        text_segmented = transcribe["text"]
+        text_overlay = ImageClip(caption_cache.get_caption(text_segmented, CAPTION_FONT_PATH, max(1, round(font_size * scale)), font_color, round(380 * scale), "center"), transparent=True)
+        text_overlay = text_overlay.with_position(("center", image_video_clip.size[1] - text_overlay.size[1] - round(25 * scale)))
+        text_overlay = text_overlay.with_start(start_time)
+        text_overlay = text_overlay.with_end(end_time)
+        all_text_clip.append(text_overlay)
+        text_height = text_overlay.size[1]
+        background_image = create_rounded_background(round(400 * scale), text_height + round(40 * scale), round(20 * scale), color=(0, 0, 0, 192))
+        background_clip = ImageClip(background_image).with_position(("center", image_video_clip.size[1] - text_overlay.size[1] - round(50 * scale)))
+        background_clip = background_clip.with_start(start_time)
+        background_clip = background_clip.with_end(end_time)
+        all_text_background_clip.append(background_clip)
+    result = CompositeVideoClip([image_video_clip, *all_text_background_clip, *all_text_clip], size=image_video_clip.size)
+    return result, [image_video_clip, audio_clip, *all_text_clip, *all_text_background_clip, result]
+
+def close_clips(clips: list):
+    for clip in clips:
+        clip.close()
+
+def render_scene_clip(target_width: int, target_height: int, type: str, image_video_path: str, audio_path: str, scene_text_transcription: dict, font_size: int = 30, font_color: str = "white", output_dir: str = workspace.OUTPUT_DIR, profile: Optional[dict] = None, include_audio: bool = True) -> str:
+    """
+    Render one sentence clip with its captions to an mp4 in output_dir, encoded with the render profile's settings.
+    Without include_audio the narration only times the clip and is left for the final mux. CPU bound, never call it on the event loop.
+    """
+    result, clips_to_close = build_scene_clip(target_width, target_height, type, image_video_path, audio_path, scene_text_transcription, font_size, font_color)
+    # Save Video To Storage
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{uuid.uuid4().hex}-final_scene_output.mp4")
+    result.write_videofile(output_path, codec="libx264", audio=include_audio, audio_codec="aac", **render_profiles.moviepy_params(profile or render_profiles.resolve()))
+    close_clips(clips_to_close)
+    return output_path
+
+def render_scene_clip_ffmpeg(target_width: int, target_height: int, type: str, image_video_path: str, audio_path: str, scene_text_transcription: dict, font_size: int = 30, font_color: str = "white", output_dir: str = workspace.OUTPUT_DIR, profile: Optional[dict] = None, include_audio: bool = True) -> str:
+    """Same contract as render_scene_clip, rendered by one ffmpeg filtergraph. Video scenes still go through MoviePy."""
+    if type == "video":
+        return render_scene_clip(target_width, target_height, type, image_video_path, audio_path, scene_text_transcription, font_size, font_color, output_dir, profile, include_audio)
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{uuid.uuid4().hex}-final_scene_output.mp4")
+    return ffmpeg_scene.render_image_scene(image_video_path, audio_path, scene_text_transcription["segments"], output_path, target_width, target_height, CAPTION_FONT_PATH, font_size, font_color, profile or render_profiles.resolve(), include_audio)
+
+def render_timeline(all_scene_clip_args: List[tuple], output_path: str, profile: Optional[dict] = None) -> str:
+    """
+    Compose every sentence clip of a job, with transitions, into one timeline and encode it once.
+    Nothing is written besides the final file, so no frame is encoded and decoded again.
+    """
+    from moviepy import concatenate_videoclips, vfx
+    clips = []
+    clips_to_close = []
+    for scene_clip_args in all_scene_clip_args:
+        result, scene_clips_to_close = build_scene_clip(*scene_clip_args)
+        clips.append(result.with_effects([vfx.CrossFadeIn(0.5), vfx.FadeOut(0.25)]))
+        clips_to_close.extend(scene_clips_to_close)
+    final_clip = concatenate_videoclips(clips, method="compose")
+    final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac", **render_profiles.moviepy_params(profile or render_profiles.resolve()))
+    close_clips([final_clip, *clips_to_close])
+    return output_path
+
+RENDER_MODE_SEGMENTS = "segments"
+RENDER_MODE_TIMELINE = "timeline"
+RENDER_MODES = (RENDER_MODE_SEGMENTS, RENDER_MODE_TIMELINE)
+RENDER_BACKEND_MOVIEPY = "moviepy"
+RENDER_BACKEND_FFMPEG = "ffmpeg"
+RENDER_BACKENDS = { RENDER_BACKEND_MOVIEPY: render_scene_clip, RENDER_BACKEND_FFMPEG: render_scene_clip_ffmpeg }
+RENDER_EXECUTOR_THREAD = "thread"
+RENDER_EXECUTOR_PROCESS = "process"
+
+def get_render_concurrency() -> int:
+    return max(1, int(os.getenv("RENDER_CONCURRENCY") or os.cpu_count() or 1))
+
+def get_render_executor() -> str:
+    return os.getenv("RENDER_EXECUTOR", RENDER_EXECUTOR_THREAD)
+
+_render_semaphore = None
+_render_pool = None
+
+def get_render_semaphore() -> asyncio.Semaphore:
+    """Shared by every job so concurrent scenes never run more encodes than there are cores."""
+    global _render_semaphore
+    if _render_semaphore is None:
+        _render_semaphore = asyncio.Semaphore(get_render_concurrency())
+    return _render_semaphore
+
+def init_render_worker():
+    """Pool initializer: a spawned worker starts empty, so MoviePy and the caption font are loaded before its first render."""
+    importlib.import_module("moviepy")
+    caption_cache.get_font(CAPTION_FONT_PATH, 30)
+
+def render_worker_ready(_) -> int:
+    return os.getpid()
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Worker processes for clip renders, so MoviePy's per-frame compositing is not serialized by the GIL."""
+    global _render_pool
+    if _render_pool is None:
+        # Spawn Rather Than Fork, The Parent Holds Threads (Whisper, Event Loop) That Must Not Be Forked
+        _render_pool = ProcessPoolExecutor(max_workers=get_render_concurrency(), mp_context=multiprocessing.get_context("spawn"), initializer=init_render_worker)
+    return _render_pool
+
+def warm_render_pool():
+    """Start every pool worker and wait until each ran its initializer. Blocking."""
+    list(get_render_pool().map(render_worker_ready, range(get_render_concurrency())))
+
+def shutdown_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+async def run_render_limited(render_function, *args, executor: Optional[str] = None) -> str:
+    """Run a blocking render function under the shared render limit, in the process pool or a worker thread."""
+    semaphore = get_render_semaphore()
+    with metrics.gauge_inside("render_waiting"):
+        await semaphore.acquire()
+    try:
+        # Pool Workers Have Their Own Metrics, So The Encode Is Timed Here In The Parent
+        with metrics.gauge_inside("render_active"), metrics.span("render"):
+            if (executor or get_render_executor()) == RENDER_EXECUTOR_PROCESS:
+                return await asyncio.get_running_loop().run_in_executor(get_render_pool(), render_function, *args)
+            return await asyncio.to_thread(render_function, *args)
+    finally:
+        semaphore.release()
+
+async def render_scene_clip_limited(*args, executor: Optional[str] = None, backend: str = RENDER_BACKEND_MOVIEPY) -> str:
+    return await run_render_limited(RENDER_BACKENDS[backend], *args, executor=executor)
+
+async def combine_video_and_audio(target_width: int, target_height: int,type: str, duration_per_scene: int, total_scene: int, all_image_video_path: List[str], all_audio_path: List[str], all_scene_text_transcription: list, font_size: int = 30, font_color: str = "white", executor: Optional[str] = None, backend: str = RENDER_BACKEND_MOVIEPY, output_dir: str = workspace.OUTPUT_DIR, profile: Optional[dict] = None, include_audio: bool = True):
+    """Render each sentence clip into output_dir; executor "process" sends every clip to the render process pool, backend "ffmpeg" renders image scenes without MoviePy."""
+    all_video_path = await asyncio.gather(*[
+        render_scene_clip_limited(target_width, target_height, type, each_image_video_path, all_audio_path[each_image_video_path_index], all_scene_text_transcription[each_image_video_path_index], font_size, font_color, output_dir, profile, include_audio, executor=executor, backend=backend)
+        for each_image_video_path_index, each_image_video_path in enumerate(all_image_video_path)
+    ])
+    return list(all_video_path)
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from time import time
-from typing import List
-import openai
+from typing import List, Optional
+from app.utils import whisper_model, caption_alignment, http_client, audio_cache, llm, metrics, pcm_audio
+import asyncio
+import httpx
 import os
-import whisper
-import requests
+import uuid
+
+CAPTION_TIMING_WHISPER = "whisper"
+CAPTION_TIMING_SOURCE = "aligned-from-source"
+CAPTION_TIMING_MODES = (CAPTION_TIMING_WHISPER, CAPTION_TIMING_SOURCE)
 
 router = APIRouter(
     prefix="/text-to-speech",
@@ -30,47 +35,76 @@ async def generate_chat_message(text: str, code: bool):
         messages= [
                 {"role": "developer", "content": [{"type": "text", "text": "You are a creative screenwriter that writes description about scenes based on prompts keyword from user.  Limit each scene description to 1000 characters"}]},
                 {"role": "user", "content": [{"type": "text", "text": f"Write One short scene descriptions for: {text}"}]}
-            ],
-        response = openai.chat.completions.create(model=os.getenv("OPENAI_MODEL"), messages=messages, max_tokens=300)
+            ]
+        content = await llm.chat_completion(model=os.getenv("OPENAI_MODEL"), messages=messages, use_cache=False, max_tokens=300)
         print("API Key Is Working")
-        print(f"Response: {response.choices[0].message.content}")
-        return { "data": response.choices[0].message.content or "" }
-    except openai.AuthenticationError:
-        print("Invalid API Key And Please Check Your Key")
-        return { "data": "" }
+        print(f"Response: {content}")
+        return { "data": content }
     except Exception as e:
-        print(f"An Error Occurred: {e}")
+        # The SDK Is Already Imported By llm Once A Request Was Attempted
+        import openai
+        if isinstance(e, openai.AuthenticationError):
+            print("Invalid API Key And Please Check Your Key")
+        else:
+            print(f"An Error Occurred: {e}")
         return { "data": "" }
-base_url = "http://localhost:8880/v1/audio"
-async def generate_text_to_speech_audio(texts: List[str], voice: str):
-    current_time = int(time() * 1000)
-    temp_dir = "temp_audios"
-    os.makedirs(temp_dir, exist_ok=True)
-    audio_files = []
-    for index, text in enumerate(texts):
-        try:
-            # Generate audio for each text
-            response = requests.post(
-                f"{base_url}/speech",
+DEFAULT_TTS_BASE_URL = "http://localhost:8880/v1/audio"
+TTS_MODEL = "kokoro"
+DEFAULT_TTS_RESPONSE_FORMAT = "wav"
+TTS_SPEED = 1.0
+TTS_DEFAULT_VOICE = "af_bella"
+
+def get_tts_base_url() -> str:
+    """Kokoro's OpenAI-compatible audio API, overridable for a local stand-in."""
+    return os.getenv("TTS_BASE_URL", DEFAULT_TTS_BASE_URL).rstrip("/")
+
+def get_tts_response_format() -> str:
+    """Uncompressed WAV is read straight into NumPy, so no audio is decoded before the final encode."""
+    return os.getenv("TTS_RESPONSE_FORMAT", DEFAULT_TTS_RESPONSE_FORMAT)
+
+async def generate_speech_file(text: str, voice: str, speech_file_path: str, index: int) -> Optional[str]:
+    # Identical Sentences Are Synthesized Once, Re-Renders And Retries Reuse The Cached Audio
+    response_format = get_tts_response_format()
+    key = audio_cache.cache_key(text, voice, TTS_MODEL, response_format, TTS_SPEED)
+    cached = await asyncio.to_thread(audio_cache.get, key)
+    if cached is not None:
+        await asyncio.to_thread(audio_cache.materialize, cached, speech_file_path)
+        print(f"Audio for '{text[:30]}...' served from cache as {speech_file_path}.")
+        return speech_file_path
+    try:
+        # Generate audio for each text
+        async with metrics.span("tts"):
+            response = await http_client.post(
+                f"{get_tts_base_url()}/speech",
+                timeout=120,
                 json={
-                    "model": "kokoro",  
+                    "model": TTS_MODEL,  
                     "input": text,
                     "voice": voice,
-                    "response_format": "mp3",
-                    "speed": 1.0
+                    "response_format": response_format,
+                    "speed": TTS_SPEED
                 }
             )
-            response.raise_for_status()  # Ensure the request was successful
-                
-            # Save the generated audio to a file
-            speech_file_path = os.path.join(temp_dir, f"{current_time}-{index}-speech.mp3")
-            with open(speech_file_path, "wb") as f:
-                    f.write(response.content)
-            audio_files.append(speech_file_path)
-            print(f"Audio for '{text[:30]}...' saved as {speech_file_path}.")
-        except requests.exceptions.RequestException as e:
-            print(f"Error generating or saving audio for text {index}: {e}")
-    return {"data": audio_files}
+        # Save the generated audio to the cache and give this job its own file name for it
+        entry = await asyncio.to_thread(audio_cache.put, key, response.content, response_format)
+        await asyncio.to_thread(audio_cache.materialize, entry, speech_file_path)
+        await asyncio.to_thread(pcm_audio.remember, speech_file_path, response.content)
+        print(f"Audio for '{text[:30]}...' saved as {speech_file_path}.")
+        return speech_file_path
+    except httpx.HTTPError as e:
+        print(f"Error generating or saving audio for text {index}: {e}")
+        return None
+
+async def generate_text_to_speech_audio(texts: List[str], voice: str, temp_dir: str = "temp_audios"):
+    # Scenes Run Concurrently, So The Timestamp Alone Is Not A Unique File Prefix
+    current_time = f"{int(time() * 1000)}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(temp_dir, exist_ok=True)
+    # Synthesize Every Sentence At The Same Time, Results Keep The Sentence Order
+    audio_files = await asyncio.gather(*[
+        generate_speech_file(text, voice, os.path.join(temp_dir, f"{current_time}-{index}-speech.{get_tts_response_format()}"), index)
+        for index, text in enumerate(texts)
+    ])
+    return {"data": [audio_file for audio_file in audio_files if audio_file is not None]}
 # async def generate_text_to_speech_audio(texts: List[str]):
 #     current_time = int(time() * 1000)
 #     temp_dir = "temp_audios"
@@ -84,13 +118,36 @@ async def generate_text_to_speech_audio(texts: List[str], voice: str):
 #     return { "data": audio_files }
 
 async def generate_timestamp_from_audio(audios: List[str]):
-    model = whisper.load_model("base")
+    transcriptions = await asyncio.to_thread(whisper_model.transcribe_audio_files, audios)
+    return { "data": transcriptions }
+
+async def generate_timestamp_from_audio_batch(all_audio_path: List[List[str]]):
+    """Transcribe the audio files of every scene of a job in one batched call."""
+    transcriptions = await asyncio.to_thread(whisper_model.transcribe_audio_batches, all_audio_path)
+    return { "data": transcriptions }
+
+def align_audio_files_from_source(audios: List[str], texts: List[str]) -> List[dict]:
+    """Time captions from the known TTS text, falling back to Whisper per file when alignment is not possible."""
+    use_energy = os.getenv("CAPTION_ENERGY_ALIGNMENT", "true").lower() not in ("0", "false", "no")
     transcriptions = []
-    for audio_file in audios:
-        if not os.path.exists(audio_file):
-            print(f"File not found! {audio_file}")
-            raise FileNotFoundError(f"The file {audio_file} does not exist.")
-        result = model.transcribe(audio_file, word_timestamps=True)
-        transcription = { "file": audio_file, "text": result["text"], "segments": result["segments"] }
-        transcriptions.append(transcription)
+    for audio_file, text in zip(audios, texts):
+        try:
+            transcriptions.append(caption_alignment.align_from_source(audio_file, text, use_energy=use_energy))
+        except Exception as e:
+            print(f"Source alignment failed for {audio_file}, falling back to Whisper: {e}")
+            transcriptions.extend(whisper_model.transcribe_audio_files([audio_file]))
+    return transcriptions
+
+async def generate_timestamp_from_source(audios: List[str], texts: List[str]):
+    """Build the same segments structure as generate_timestamp_from_audio without running Whisper."""
+    if len(audios) != len(texts):
+        # A Failed TTS Call Leaves Audio And Text Out Of Step, So Only Whisper Can Time It
+        return await generate_timestamp_from_audio(audios)
+    transcriptions = await asyncio.to_thread(align_audio_files_from_source, audios, texts)
     return { "data": transcriptions }
+
+async def generate_timestamp_for_job(all_audio_path: List[List[str]], all_texts: List[List[str]], caption_timing: str = CAPTION_TIMING_WHISPER):
+    """Time the captions of every scene of a job with the selected caption timing mode."""
+    if caption_timing == CAPTION_TIMING_SOURCE:
+        return { "data": [(await generate_timestamp_from_source(audios, texts))["data"] for audios, texts in zip(all_audio_path, all_texts)] }
+    return await generate_timestamp_from_audio_batch(all_audio_path)
@@ -0,0 +1,115 @@
+import io
+import os
+import json
+import wave
+import hashlib
+import threading
+from time import time
+from typing import Optional
+from . import pcm_audio
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_lock = threading.Lock()
+_index: Optional[dict] = None
+# Hits Only Move last_access In Memory, The Index Is Written On put() And flush()
+_dirty = False
+stats = { "hits": 0, "misses": 0, "evictions": 0 }
+
+def get_cache_dir() -> str:
+    cache_dir = os.getenv("AUDIO_CACHE_DIR", os.path.join("cache", "tts"))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def get_max_bytes() -> int:
+    return int(os.getenv("AUDIO_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+def cache_key(text: str, voice: str, model: str, response_format: str, speed: float) -> str:
+    """Content address of a synthesized sentence: everything that changes the audio is part of the key."""
+    return hashlib.sha256(json.dumps([text, voice, model, response_format, speed]).encode()).hexdigest()
+
+def _index_path() -> str:
+    return os.path.join(get_cache_dir(), "index.json")
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        try:
+            with open(_index_path()) as f:
+                _index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _index = {}
+    return _index
+
+def _save_index():
+    global _dirty
+    _dirty = False
+    temp_path = f"{_index_path()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(_index, f)
+    os.replace(temp_path, _index_path())
+
+def get(key: str) -> Optional[dict]:
+    """Return the cache entry ({"file", "size", "duration", "last_access"}) for a key, or None on a miss."""
+    global _dirty
+    with _lock:
+        entry = _load_index().get(key)
+        if entry is None or not os.path.exists(entry["file"]):
+            stats["misses"] += 1
+            return None
+        entry["last_access"] = time()
+        stats["hits"] += 1
+        _dirty = True
+        return dict(entry)
+
+def flush():
+    """Persist access times recorded by hits since the last write, e.g. at shutdown."""
+    with _lock:
+        if _dirty:
+            _save_index()
+
+def _duration(file_path: str, content: bytes) -> float:
+    """Seconds of audio from the WAV header (frames / rate), without a subprocess; other formats are decoded once."""
+    try:
+        with wave.open(io.BytesIO(content)) as wav_file:
+            frames, frame_size, sample_rate = wav_file.getnframes(), wav_file.getnchannels() * wav_file.getsampwidth(), wav_file.getframerate()
+        # A Streamed Header Has A Placeholder Frame Count, Trust It Only When The Data Is Really There
+        if 0 < frames * frame_size <= len(content):
+            return frames / sample_rate
+    except (wave.Error, EOFError):
+        pass
+    return len(pcm_audio.decode_with_ffmpeg(file_path)) / pcm_audio.FALLBACK_SAMPLE_RATE
+
+def put(key: str, content: bytes, extension: str) -> dict:
+    """Store synthesized audio with its decoded duration, evicting least recently used entries over the size bound."""
+    file_path = os.path.join(get_cache_dir(), f"{key}.{extension}")
+    temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    os.replace(temp_path, file_path)
+    entry = { "file": file_path, "size": len(content), "duration": _duration(file_path, content), "last_access": time() }
+    with _lock:
+        index = _load_index()
+        index[key] = entry
+        total_size = sum(each_entry["size"] for each_entry in index.values())
+        for old_key, old_entry in sorted(index.items(), key=lambda item: item[1]["last_access"]):
+            if total_size <= get_max_bytes() or old_key == key:
+                break
+            if os.path.exists(old_entry["file"]):
+                os.remove(old_entry["file"])
+            total_size -= old_entry["size"]
+            del index[old_key]
+            stats["evictions"] += 1
+        _save_index()
+    return dict(entry)
+
+def materialize(entry: dict, path: str) -> str:
+    """Give a job its own name for a cached file; a hard link costs no copy and survives later eviction."""
+    if os.path.exists(path):
+        os.remove(path)
+    try:
+        os.link(entry["file"], path)
+    except OSError:
+        with open(entry["file"], "rb") as source, open(path, "wb") as target:
+            target.write(source.read())
+    return path
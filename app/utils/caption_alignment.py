@@ -0,0 +1,86 @@
+import numpy as np
+from typing import List, Tuple
+from . import pcm_audio
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+MIN_PAUSE_SECONDS = 0.15
+MAX_PAUSE_SNAP_SECONDS = 0.75
+MAX_CAPTION_WORDS = 14
+CLAUSE_PUNCTUATION = ",;:.!?"
+
+def decode_audio(audio_file: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Mono float32 samples of an audio file, from the in-memory PCM path when it was synthesized as WAV."""
+    return pcm_audio.load_resampled(audio_file, sample_rate)
+
+def detect_speech(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Tuple[float, float, List[float]]:
+    """Find where speech starts and ends and the midpoints of the pauses in between, from frame energy."""
+    duration = len(samples) / sample_rate
+    frame_length = int(sample_rate * FRAME_SECONDS)
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return 0.0, duration, []
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+    threshold = max(np.percentile(energy, 95) * 0.1, 1e-4)
+    voiced = energy > threshold
+    voiced_index = np.flatnonzero(voiced)
+    if len(voiced_index) == 0:
+        return 0.0, duration, []
+    first, last = voiced_index[0], voiced_index[-1]
+    # Runs Of Silent Frames Strictly Inside The Voiced Span Are Pauses Between Words Or Clauses
+    pauses = []
+    silent = ~voiced[first:last + 1]
+    edges = np.diff(np.concatenate([[0], silent.astype(np.int8), [0]]))
+    for run_start, run_end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        if (run_end - run_start) * FRAME_SECONDS >= MIN_PAUSE_SECONDS:
+            pauses.append((first + (run_start + run_end) / 2) * FRAME_SECONDS)
+    return first * FRAME_SECONDS, min((last + 1) * FRAME_SECONDS, duration), pauses
+
+def align_words(text: str, start: float, end: float, pauses: List[float]) -> List[dict]:
+    """Spread the words of a sentence over [start, end] by character length, snapping clause breaks to pauses."""
+    words = text.split()
+    if not words:
+        return []
+    weights = np.array([len(word) + 1 for word in words], dtype=np.float64)
+    boundaries = start + (end - start) * np.concatenate([[0.0], np.cumsum(weights) / weights.sum()])
+    clause_boundaries = [index + 1 for index, word in enumerate(words[:-1]) if word[-1] in CLAUSE_PUNCTUATION]
+    for pause in pauses:
+        if not clause_boundaries:
+            break
+        nearest = min(clause_boundaries, key=lambda index: abs(boundaries[index] - pause))
+        if abs(boundaries[nearest] - pause) <= MAX_PAUSE_SNAP_SECONDS:
+            boundaries[nearest] = pause
+    boundaries = np.maximum.accumulate(boundaries)
+    return [
+        { "word": f" {word}", "start": round(float(boundaries[index]), 2), "end": round(float(boundaries[index + 1]), 2), "probability": 1.0 }
+        for index, word in enumerate(words)
+    ]
+
+def group_segments(words: List[dict]) -> List[dict]:
+    """Group words into caption segments, breaking long sentences at clause punctuation."""
+    segments = []
+    current = []
+    for word in words:
+        current.append(word)
+        at_clause = word["word"][-1] in CLAUSE_PUNCTUATION
+        if len(current) >= MAX_CAPTION_WORDS or (at_clause and len(current) >= MAX_CAPTION_WORDS // 2):
+            segments.append(current)
+            current = []
+    if current:
+        segments.append(current)
+    return [
+        { "id": index, "start": group[0]["start"], "end": group[-1]["end"], "text": "".join(word["word"] for word in group), "words": group }
+        for index, group in enumerate(segments)
+    ]
+
+def align_from_source(audio_file: str, text: str, use_energy: bool = True) -> dict:
+    """Build a Whisper-shaped transcription for audio whose spoken text is already known."""
+    samples = decode_audio(audio_file)
+    duration = len(samples) / SAMPLE_RATE
+    if use_energy:
+        start, end, pauses = detect_speech(samples)
+    else:
+        start, end, pauses = 0.0, duration, []
+    words = align_words(text.strip(), start, end, pauses)
+    return { "file": audio_file, "text": f" {text.strip()}", "segments": group_segments(words) }
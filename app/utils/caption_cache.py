@@ -0,0 +1,100 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from . import metrics
+
+DEFAULT_CACHE_SIZE = 512
+LINE_SPACING = 4
+
+_captions: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+stats = { "hits": 0, "disk_hits": 0, "misses": 0 }
+
+def get_cache_size() -> int:
+    return int(os.getenv("CAPTION_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+
+def get_cache_dir() -> str:
+    """Optional directory that keeps caption rasters across restarts and render worker processes."""
+    return os.getenv("CAPTION_CACHE_DIR", "")
+
+@lru_cache(maxsize=32)
+def get_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """Fonts are parsed from disk once per process and kept warm."""
+    return ImageFont.truetype(font_path, font_size)
+
+def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list:
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and font.getlength(candidate) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+def rasterize_caption(text: str, font_path: str, font_size: int, color: str, wrap_width: int, align: str = "center") -> np.ndarray:
+    """Draw wrapped caption text on a transparent canvas as an RGBA array, like TextClip(method="caption")."""
+    font = get_font(font_path, font_size)
+    multiline = "\n".join(wrap_text(text.strip(), font, wrap_width))
+    probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    _, _, _, bottom = probe.multiline_textbbox((0, 0), multiline, font=font, spacing=LINE_SPACING, align=align)
+    # Leave Room Below The Last Baseline So Descenders Are Not Clipped
+    height = max(1, int(bottom + font_size * 0.25))
+    image = Image.new("RGBA", (wrap_width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    x = { "left": 0, "center": wrap_width / 2, "right": wrap_width }[align]
+    anchor = { "left": "la", "center": "ma", "right": "ra" }[align]
+    draw.multiline_text((x, 0), multiline, font=font, fill=color, spacing=LINE_SPACING, align=align, anchor=anchor)
+    return np.array(image)
+
+def _cache_key(text: str, font_path: str, font_size: int, color: str, wrap_width: int, align: str) -> str:
+    return hashlib.sha256(repr((text.strip(), os.path.basename(font_path), font_size, color, wrap_width, align)).encode()).hexdigest()
+
+def get_caption(text: str, font_path: str, font_size: int, color: str, wrap_width: int, align: str = "center") -> np.ndarray:
+    """Return the caption raster from the in-memory LRU, the disk cache, or by rasterizing it."""
+    key = _cache_key(text, font_path, font_size, color, wrap_width, align)
+    with _lock:
+        caption = _captions.get(key)
+        if caption is not None:
+            _captions.move_to_end(key)
+            stats["hits"] += 1
+            return caption
+    cache_dir = get_cache_dir()
+    disk_path = os.path.join(cache_dir, f"{key}.npy") if cache_dir else ""
+    if disk_path and os.path.exists(disk_path):
+        caption = np.load(disk_path)
+        stats["disk_hits"] += 1
+    else:
+        with metrics.span("caption_rasterize"):
+            caption = rasterize_caption(text, font_path, font_size, color, wrap_width, align)
+        stats["misses"] += 1
+        if disk_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+            np.save(temp_path, caption)
+            os.replace(temp_path, disk_path)
+    # Cached Arrays Are Shared Between Clips, Nobody May Write Into Them
+    caption.setflags(write=False)
+    with _lock:
+        _captions[key] = caption
+        while len(_captions) > get_cache_size():
+            _captions.popitem(last=False)
+    return caption
+
+@lru_cache(maxsize=64)
+def get_rounded_background(width: int, height: int, radius: int, color: tuple) -> np.ndarray:
+    """Rounded caption backgrounds only depend on their size and color, so each one is rasterized once."""
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle([(0, 0), (width, height)], radius=radius, fill=color)
+    background = np.array(image)
+    background.setflags(write=False)
+    return background
@@ -0,0 +1,84 @@
+import os
+import ffmpeg
+from PIL import ImageColor
+from typing import List
+from . import caption_cache, render_profiles, pcm_audio
+from .ken_burns import DEFAULT_ZOOM_PER_SECOND
+
+CAPTION_WIDTH = 380
+CAPTION_BOTTOM_MARGIN = 25
+CAPTION_BOX_PADDING = 20
+CAPTION_BOX_ALPHA = 192
+
+def ass_color(color: str, alpha: int = 255) -> str:
+    """Convert a CSS color name or hex value to the ASS &HAABBGGRR form (ASS alpha 00 is opaque)."""
+    red, green, blue = ImageColor.getrgb(color)[:3]
+    return f"&H{255 - alpha:02X}{blue:02X}{green:02X}{red:02X}"
+
+def ass_time(seconds: float) -> str:
+    centiseconds = int(round(max(seconds, 0) * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    return f"{hours}:{minutes:02d}:{centiseconds // 100:02d}.{centiseconds % 100:02d}"
+
+def ass_text(text: str) -> str:
+    # Braces Start Override Tags In ASS, Captions Are Plain Text
+    return text.strip().replace("{", "(").replace("}", ")").replace("\n", "\\N")
+
+def write_ass_subtitles(segments: List[dict], subtitle_path: str, width: int, height: int, font_path: str, font_size: int, font_color: str) -> str:
+    """Write transcript segments as an ASS file styled like the MoviePy captions: centered, wrapped, on a dark box, scaled with the frame."""
+    scale = render_profiles.caption_scale(width, height)
+    font_size = max(1, round(font_size * scale))
+    font_name = caption_cache.get_font(font_path, font_size).getname()[0]
+    side_margin = max(0, (width - round(CAPTION_WIDTH * scale)) // 2)
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Caption,{font_name},{font_size},{ass_color(font_color)},{ass_color(font_color)},{ass_color('black', CAPTION_BOX_ALPHA)},{ass_color('black', CAPTION_BOX_ALPHA)},0,0,0,0,100,100,0,0,3,{round(CAPTION_BOX_PADDING * scale) // 2},0,2,{side_margin},{side_margin},{round(CAPTION_BOTTOM_MARGIN * scale)},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for segment in segments:
+        lines.append(f"Dialogue: 0,{ass_time(segment['start'])},{ass_time(segment['end'])},Caption,,0,0,0,,{ass_text(segment['text'])}")
+    with open(subtitle_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return subtitle_path
+
+def probe_duration(media_path: str) -> float:
+    return float(ffmpeg.probe(media_path)["format"]["duration"])
+
+def render_image_scene(image_path: str, audio_path: str, segments: List[dict], output_path: str, width: int, height: int, font_path: str, font_size: int, font_color: str, profile: dict, include_audio: bool = True, zoom_per_second: float = DEFAULT_ZOOM_PER_SECOND) -> str:
+    """
+    Render a still-image scene as a single ffmpeg graph: cover-scale, center zoom,
+    burned-in ASS captions and, with include_audio, the narration track. No frame passes through Python.
+    Frame rate, preset, CRF and threads come from the render profile.
+    """
+    fps = profile["fps"]
+    duration = pcm_audio.duration(audio_path)
+    subtitle_path = f"{os.path.splitext(output_path)[0]}.ass"
+    write_ass_subtitles(segments, subtitle_path, width, height, font_path, font_size, font_color)
+    try:
+        video = (
+            ffmpeg
+            .input(image_path, loop=1, framerate=fps, t=duration)
+            .filter("scale", width, height, force_original_aspect_ratio="increase")
+            .filter("crop", width, height)
+            .filter("zoompan", z=f"1+{zoom_per_second}*in/{fps}", x="iw/2-(iw/zoom/2)", y="ih/2-(ih/zoom/2)", d=1, s=f"{width}x{height}", fps=fps)
+            .filter("subtitles", subtitle_path, fontsdir=os.path.dirname(font_path))
+        )
+        if include_audio:
+            output = ffmpeg.output(video, ffmpeg.input(audio_path), output_path, vcodec="libx264", acodec="aac", pix_fmt="yuv420p", shortest=None, **render_profiles.ffmpeg_params(profile))
+        else:
+            output = ffmpeg.output(video, output_path, vcodec="libx264", pix_fmt="yuv420p", t=duration, **render_profiles.ffmpeg_params(profile))
+        output.run(overwrite_output=True, quiet=True)
+    finally:
+        os.remove(subtitle_path)
+    return output_path
@@ -0,0 +1,87 @@
+import os
+import math
+import ffmpeg
+import threading
+from typing import List, Optional
+from . import render_profiles
+
+HLS_SEGMENT_SECONDS = 4
+PLAYLIST_NAME = "index.m3u8"
+
+def target_duration(profile: dict) -> int:
+    """
+    Longest segment a profile's clips can produce, in whole seconds. Segments are cut on existing keyframes
+    without re-encoding, so that is the keyframe spacing; one second more absorbs frame timestamp rounding.
+    """
+    return max(HLS_SEGMENT_SECONDS, math.ceil(render_profiles.keyframe_interval(profile) / profile["fps"])) + 1
+
+class HlsPlaylist:
+    """
+    An EVENT playlist that grows as scenes finish. Scenes may finish out of order;
+    each one is published only once every scene before it is published too.
+    The target duration is fixed when the playlist is created, players reject an EVENT playlist that changes it.
+    """
+
+    def __init__(self, output_dir: str, profile: Optional[dict] = None):
+        self.output_dir = output_dir
+        self.target_duration = target_duration(profile or render_profiles.resolve())
+        self.ready = {}
+        self.published = []
+        self.finished = False
+        self.lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+        self._write_playlist()
+
+    def _segment_clip(self, video_path: str, prefix: str) -> List[tuple]:
+        """Remux one rendered clip into MPEG-TS segments and return their (duration, file name) pairs."""
+        clip_playlist = os.path.join(self.output_dir, f"{prefix}.m3u8")
+        (
+            ffmpeg
+            .input(video_path)
+            .output(clip_playlist, format="hls", c="copy", hls_time=HLS_SEGMENT_SECONDS, hls_list_size=0, hls_segment_filename=os.path.join(self.output_dir, f"{prefix}_%03d.ts"))
+            .run(overwrite_output=True, quiet=True)
+        )
+        segments = []
+        with open(clip_playlist) as f:
+            lines = [line.strip() for line in f]
+        for index, line in enumerate(lines):
+            if line.startswith("#EXTINF:"):
+                segments.append((float(line[len("#EXTINF:"):].rstrip(",")), lines[index + 1]))
+        os.remove(clip_playlist)
+        for duration, file_name in segments:
+            # Rounded To The Nearest Second, Every Segment Must Fit The Target Duration
+            if round(duration) > self.target_duration:
+                raise ValueError(f"HLS segment {file_name} lasts {duration:.3f}s, longer than the target duration of {self.target_duration}s")
+        return segments
+
+    def add_scene(self, scene_index: int, all_video_path: List[str]):
+        """Segment a finished scene's clips and publish every scene that is now contiguous. Blocking."""
+        clips = [self._segment_clip(video_path, f"scene{scene_index:03d}_{clip_index:02d}") for clip_index, video_path in enumerate(all_video_path)]
+        with self.lock:
+            self.ready[scene_index] = clips
+            while len(self.published) in self.ready:
+                self.published.append(self.ready.pop(len(self.published)))
+            self._write_playlist()
+
+    def finish(self):
+        with self.lock:
+            self.finished = True
+            self._write_playlist()
+
+    def _write_playlist(self):
+        clips = [clip for scene in self.published for clip in scene]
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{self.target_duration}", "#EXT-X-MEDIA-SEQUENCE:0", "#EXT-X-PLAYLIST-TYPE:EVENT"]
+        for clip_index, clip in enumerate(clips):
+            # Every Clip Was Encoded On Its Own, Timestamps Restart At Each Boundary
+            if clip_index > 0:
+                lines.append("#EXT-X-DISCONTINUITY")
+            for duration, file_name in clip:
+                lines.append(f"#EXTINF:{duration:.3f},")
+                lines.append(file_name)
+        if self.finished:
+            lines.append("#EXT-X-ENDLIST")
+        path = os.path.join(self.output_dir, PLAYLIST_NAME)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
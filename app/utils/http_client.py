@@ -0,0 +1,66 @@
+import os
+import asyncio
+import httpx
+from urllib.parse import urlsplit
+from typing import Optional
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_PER_HOST_LIMIT = 8
+DOWNLOAD_CHUNK_SIZE = 1024 * 64
+
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: dict = {}
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, so keep-alive connections are reused across requests."""
+    global _client
+    if _client is None or _client.is_closed:
+        max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            follow_redirects=True,
+        )
+    return _client
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(int(os.getenv("HTTP_PER_HOST_LIMIT", DEFAULT_PER_HOST_LIMIT)))
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the shared pool, at most HTTP_PER_HOST_LIMIT at a time per host."""
+    async with _host_semaphore(url):
+        return await get_client().request(method, url, **kwargs)
+
+async def get_json(url: str, params: Optional[dict] = None, timeout: float = DEFAULT_TIMEOUT):
+    response = await request("GET", url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+async def post(url: str, json: dict, timeout: float = DEFAULT_TIMEOUT) -> httpx.Response:
+    response = await request("POST", url, json=json, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+async def download(url: str, path: str, timeout: float = DEFAULT_TIMEOUT) -> str:
+    """Stream a remote file to disk without holding it in memory."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    async with _host_semaphore(url):
+        async with get_client().stream("GET", url, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(path, "wb") as file:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
+    return path
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_semaphores.clear()
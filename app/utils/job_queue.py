@@ -0,0 +1,75 @@
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+from . import job_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_QUEUED = 50
+
+_queue: Optional[asyncio.Queue] = None
+_pending: List[str] = []
+_workers: List[asyncio.Task] = []
+
+class QueueFullError(Exception):
+    pass
+
+def get_worker_count() -> int:
+    return max(1, int(os.getenv("GENERATE_AI_WORKERS", DEFAULT_WORKERS)))
+
+def get_max_queued() -> int:
+    return max(1, int(os.getenv("GENERATE_AI_MAX_QUEUED", DEFAULT_MAX_QUEUED)))
+
+def queue_position(job_id: str) -> Optional[int]:
+    """Return the 1-based position of a job waiting in the queue, or None once it has started."""
+    try:
+        return _pending.index(job_id) + 1
+    except ValueError:
+        return None
+
+def queue_depth() -> int:
+    return len(_pending)
+
+def submit(job_id: str):
+    if _queue is None:
+        raise RuntimeError("Job workers are not running")
+    if len(_pending) >= get_max_queued():
+        raise QueueFullError(f"The job queue is full ({get_max_queued()} jobs waiting)")
+    _pending.append(job_id)
+    _queue.put_nowait(job_id)
+
+async def _worker(handler: Callable[[dict], Awaitable[None]]):
+    while True:
+        job_id = await _queue.get()
+        try:
+            if job_id in _pending:
+                _pending.remove(job_id)
+            job = job_store.update_job(job_id, status=job_store.JOB_STATUS_RUNNING, stage=job_store.JOB_STATUS_RUNNING)
+            if job is not None:
+                await handler(job)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            job_store.update_job(job_id, status=job_store.JOB_STATUS_FAILED, stage=job_store.JOB_STATUS_FAILED, error=str(e))
+        finally:
+            _queue.task_done()
+
+async def start_workers(handler: Callable[[dict], Awaitable[None]]):
+    """Start the bounded worker pool and re-queue jobs left over from a previous process."""
+    global _queue
+    _queue = asyncio.Queue()
+    for job in job_store.list_jobs(job_store.JOB_STATUS_RUNNING):
+        job_store.update_job(job["id"], status=job_store.JOB_STATUS_FAILED, stage=job_store.JOB_STATUS_FAILED, error="Interrupted by a server restart")
+    for job in job_store.list_jobs(job_store.JOB_STATUS_QUEUED):
+        _pending.append(job["id"])
+        _queue.put_nowait(job["id"])
+    for _ in range(get_worker_count()):
+        _workers.append(asyncio.create_task(_worker(handler)))
+    logger.info(f"Started {len(_workers)} generate-ai workers with {len(_pending)} queued jobs")
+
+async def stop_workers():
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
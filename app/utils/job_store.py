@@ -0,0 +1,80 @@
+import os
+import json
+import uuid
+import threading
+from time import time
+from typing import Optional
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+
+_lock = threading.Lock()
+
+def get_jobs_dir() -> str:
+    jobs_dir = os.getenv("JOB_STORE_DIR", "temp_jobs")
+    os.makedirs(jobs_dir, exist_ok=True)
+    return jobs_dir
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(get_jobs_dir(), f"{job_id}.json")
+
+def _write_job(job: dict):
+    # Write Then Rename So A Crash Never Leaves A Half Written Status File
+    path = _job_path(job["id"])
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(job, f)
+    os.replace(temp_path, path)
+
+def create_job(params: dict) -> dict:
+    now = time()
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": JOB_STATUS_QUEUED,
+        "stage": JOB_STATUS_QUEUED,
+        "completed": 0,
+        "total": 0,
+        "stages": [{ "stage": JOB_STATUS_QUEUED, "at": now }],
+        "params": params,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    with _lock:
+        _write_job(job)
+    return job
+
+def get_job(job_id: str) -> Optional[dict]:
+    # Job Ids Are Generated By uuid4().hex, Anything Else Would Escape The Store Directory
+    if not job_id.isalnum():
+        return None
+    try:
+        with open(_job_path(job_id)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def update_job(job_id: str, **fields) -> Optional[dict]:
+    with _lock:
+        job = get_job(job_id)
+        if job is None:
+            return None
+        now = time()
+        if "stage" in fields and fields["stage"] != job["stage"]:
+            job["stages"].append({ "stage": fields["stage"], "at": now })
+        job.update(fields)
+        job["updated_at"] = now
+        _write_job(job)
+    return job
+
+def list_jobs(status: Optional[str] = None) -> list:
+    jobs = []
+    for filename in os.listdir(get_jobs_dir()):
+        if filename.endswith(".json"):
+            job = get_job(filename[:-len(".json")])
+            if job is not None and (status is None or job["status"] == status):
+                jobs.append(job)
+    return sorted(jobs, key=lambda job: job["created_at"])
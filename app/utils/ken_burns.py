@@ -0,0 +1,27 @@
+import numpy as np
+from PIL import Image
+
+DEFAULT_ZOOM_PER_SECOND = 0.02
+
+def ken_burns_clip(image_path: str, target_width: int, target_height: int, duration: float, zoom_per_second: float = DEFAULT_ZOOM_PER_SECOND):
+    """
+    Slow center zoom over a still image, rendered at the output size.
+    The image is decoded and pre-scaled once; each frame only samples the visible box of it.
+    """
+    source = Image.open(image_path).convert("RGB")
+    max_zoom = 1 + zoom_per_second * max(duration, 0)
+    # Pre-Scale So The Deepest Zoom Still Maps About One Source Pixel To One Output Pixel, Never Upscaling Here
+    prescale = min(1.0, max(target_width / source.width, target_height / source.height) * max_zoom)
+    if prescale < 1.0:
+        source = source.resize((max(1, round(source.width * prescale)), max(1, round(source.height * prescale))), Image.LANCZOS)
+    cover = max(target_width / source.width, target_height / source.height)
+    center_x, center_y = source.width / 2, source.height / 2
+
+    def frame_function(t):
+        zoom = cover * (1 + zoom_per_second * t)
+        half_width, half_height = target_width / zoom / 2, target_height / zoom / 2
+        box = (center_x - half_width, center_y - half_height, center_x + half_width, center_y + half_height)
+        return np.asarray(source.resize((target_width, target_height), Image.BILINEAR, box=box))
+
+    from moviepy import VideoClip
+    return VideoClip(frame_function=frame_function, duration=duration)
@@ -0,0 +1,121 @@
+"""
+Keyword extraction for Pixabay video queries, scored against a precomputed term weight table.
+
+The shipped table is hand-curated (stop words, then searchable subjects above descriptive and generic words),
+unknown words get a low default weight. Replace it with real IDF from a corpus of plain text files (one document per file, or per line with --lines):
+    python -m app.utils.keywords build <corpus_dir> [--lines]
+"""
+import os
+import re
+import sys
+import math
+import numpy as np
+from collections import Counter
+from typing import List, Optional
+
+IDF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src", "data", "keyword_idf.tsv")
+# Pixabay ANDs Every Term, More Than Three Rarely Finds A Video
+DEFAULT_TOP_K = 3
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+_table: Optional[tuple] = None
+
+def get_idf_path() -> str:
+    return os.getenv("KEYWORD_IDF_PATH", IDF_PATH)
+
+def load_idf_table(path: Optional[str] = None) -> tuple:
+    """Parse the table into ({term: idf}, default idf for unseen terms). Terms with idf 0 are stop words."""
+    idf = {}
+    default_idf = 0.0
+    with open(path or get_idf_path()) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("# default\t"):
+                default_idf = float(line.split("\t")[1])
+            elif line and not line.startswith("#"):
+                term, value = line.split("\t")
+                idf[term] = float(value)
+    return idf, default_idf
+
+def get_idf_table() -> tuple:
+    """Loaded once per process."""
+    global _table
+    if _table is None:
+        _table = load_idf_table()
+    return _table
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def term_idf(term: str, idf: dict, default_idf: float) -> float:
+    if term in idf:
+        return idf[term]
+    # Plurals And Possessives Share The Weight Of Their Base Word
+    for suffix in ("'s", "es", "s"):
+        if term.endswith(suffix) and term[:-len(suffix)] in idf:
+            return idf[term[:-len(suffix)]]
+    return default_idf
+
+def top_terms(texts: List[str], k: int = DEFAULT_TOP_K) -> List[List[str]]:
+    """Top-k TF-IDF terms of every text, scored in one pass over a (texts x vocabulary) count matrix."""
+    idf, default_idf = get_idf_table()
+    all_tokens = [tokenize(text) for text in texts]
+    vocabulary = {}
+    for tokens in all_tokens:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return [[] for _ in texts]
+    rows = np.repeat(np.arange(len(all_tokens)), [len(tokens) for tokens in all_tokens])
+    columns = np.fromiter((vocabulary[token] for tokens in all_tokens for token in tokens), dtype=np.int64, count=len(rows))
+    counts = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (rows, columns), 1)
+    weights = np.array([term_idf(term, idf, default_idf) for term in vocabulary], dtype=np.float32)
+    # Sublinear Term Frequency, So One Repeated Word Does Not Drown The Rest Of The Scene
+    scores = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0) * weights
+    terms = np.array(list(vocabulary))
+    # Stable Sort Keeps The Order Of First Appearance Between Equal Scores
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return [[str(terms[column]) for column in row_order if scores[row, column] > 0] for row, row_order in enumerate(order)]
+
+def broaden(query: str) -> List[str]:
+    """The query, then shorter queries dropping its lowest scored trailing terms, for retries on zero hits."""
+    terms = query.split()
+    return [" ".join(terms[:length]) for length in range(len(terms), 0, -1)] or [query]
+
+def build_idf_table(documents: List[str], output_path: str, min_df: int = 2, stop_words: Optional[set] = None):
+    """
+    Write a smoothed IDF table (ln((1 + N) / (1 + df)) + 1) for every term in at least min_df documents.
+    Unknown words get the median weight, so a misspelling or rare filler word does not outrank every subject.
+    """
+    document_frequency = Counter()
+    for document in documents:
+        document_frequency.update(set(tokenize(document)))
+    total = len(documents)
+    stop_words = stop_words if stop_words is not None else {term for term, value in get_idf_table()[0].items() if value == 0}
+    weights = [
+        (term, math.log((1 + total) / (1 + frequency)) + 1)
+        for term, frequency in document_frequency.most_common()
+        if frequency >= min_df and term not in stop_words
+    ]
+    default_idf = float(np.median([weight for _, weight in weights])) if weights else 1.0
+    lines = ["# Keyword IDF table, term<TAB>idf. Stop words have idf 0 and are never returned.", f"# default\t{default_idf:.3f}"]
+    lines.extend(f"{term}\t0" for term in sorted(stop_words))
+    lines.extend(f"{term}\t{weight:.3f}" for term, weight in weights)
+    with open(output_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+def main(argv: List[str]):
+    if len(argv) < 2 or argv[0] != "build":
+        print(__doc__)
+        return
+    documents = []
+    for root, _, files in os.walk(argv[1]):
+        for file_name in sorted(files):
+            with open(os.path.join(root, file_name), errors="ignore") as f:
+                documents.extend(f.read().splitlines() if "--lines" in argv else [f.read()])
+    build_idf_table(documents, get_idf_path())
+    print(f"Wrote IDF table for {len(documents)} documents to {get_idf_path()}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
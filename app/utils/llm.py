@@ -0,0 +1,61 @@
+import os
+import json
+import hashlib
+import asyncio
+from typing import Callable, Optional
+from . import metrics
+
+_client = None
+stats = { "hits": 0, "misses": 0 }
+
+def get_client():
+    """Process-wide async OpenAI client, so LLM calls never block the event loop. The SDK is imported on first use."""
+    global _client
+    if _client is None:
+        import openai
+        _client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL") or None)
+    return _client
+
+def get_cache_dir() -> str:
+    cache_dir = os.getenv("LLM_CACHE_DIR", os.path.join("cache", "llm"))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def _read_cached(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return json.load(f)["content"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+def _write_cached(path: str, content: str):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({ "content": content }, f)
+    os.replace(temp_path, path)
+
+async def chat_completion(model: str, messages: list, use_cache: bool = True, validate: Optional[Callable[[str], bool]] = None, **params) -> str:
+    """
+    Return the first choice's content, persisted under a hash of the model, prompt and parameters.
+    With validate, only replies it accepts are cached, and a cached reply it rejects counts as a miss.
+    """
+    key = hashlib.sha256(json.dumps([model, messages, params], sort_keys=True).encode()).hexdigest()
+    path = os.path.join(get_cache_dir(), f"{key}.json")
+    if use_cache:
+        cached = await asyncio.to_thread(_read_cached, path)
+        if cached is not None and (validate is None or validate(cached)):
+            stats["hits"] += 1
+            return cached
+    stats["misses"] += 1
+    async with metrics.span("llm"):
+        response = await get_client().chat.completions.create(model=model, messages=messages, **params)
+    content = response.choices[0].message.content or ""
+    if use_cache and content and (validate is None or validate(content)):
+        await asyncio.to_thread(_write_cached, path, content)
+    return content
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,136 @@
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "ai_video"
+# Seconds, Wide Enough For A Cached Lookup And A Full Job Encode
+BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()
+_histograms: dict = {}
+_gauges: dict = {}
+_stats: dict = {}
+_gauge_functions: dict = {}
+
+# Context Variables Follow asyncio Tasks And asyncio.to_thread, So Spans Deep In The Pipeline Know Their Job And Scene
+current_job: ContextVar[Optional[str]] = ContextVar("current_job", default=None)
+current_scene: ContextVar[Optional[int]] = ContextVar("current_scene", default=None)
+_job_timings: ContextVar[Optional[dict]] = ContextVar("job_timings", default=None)
+
+def observe(stage: str, seconds: float):
+    """Record one duration in the stage histogram and, inside a job context, in that job's breakdown."""
+    with _lock:
+        histogram = _histograms.setdefault(stage, { "buckets": [0] * len(BUCKETS), "count": 0, "sum": 0.0 })
+        index = bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            histogram["buckets"][index] += 1
+        histogram["count"] += 1
+        histogram["sum"] += seconds
+        timings = _job_timings.get()
+        if timings is not None:
+            stage_timing = timings["stages"].setdefault(stage, { "count": 0, "total_s": 0.0, "max_s": 0.0 })
+            stage_timing["count"] += 1
+            stage_timing["total_s"] = round(stage_timing["total_s"] + seconds, 4)
+            stage_timing["max_s"] = round(max(stage_timing["max_s"], seconds), 4)
+            scene = current_scene.get()
+            if scene is not None:
+                scene_timing = timings["scenes"].setdefault(str(scene), {})
+                scene_timing[stage] = round(scene_timing.get(stage, 0.0) + seconds, 4)
+
+class span:
+    """Time a pipeline stage. Works with `with` and `async with`; tagged with the current job and scene in the debug log."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        seconds = perf_counter() - self.start
+        observe(self.stage, seconds)
+        logger.debug(f"span stage={self.stage} job={current_job.get()} scene={current_scene.get()} seconds={seconds:.4f} error={exc_type.__name__ if exc_type else None}")
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return self.__exit__(exc_type, exc, traceback)
+
+@contextmanager
+def job_context(job_id: Optional[str]):
+    """Bind a job id for the spans underneath and collect their per-job breakdown into the yielded dict."""
+    timings = { "stages": {}, "scenes": {} }
+    job_token = current_job.set(job_id)
+    timings_token = _job_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        current_job.reset(job_token)
+        _job_timings.reset(timings_token)
+
+def set_scene(scene_index: Optional[int]):
+    """Tag the spans of the current task with a scene index; each asyncio task has its own copy."""
+    current_scene.set(scene_index)
+
+def gauge_add(name: str, value: float):
+    with _lock:
+        _gauges[name] = _gauges.get(name, 0) + value
+
+@contextmanager
+def gauge_inside(name: str):
+    """Count how many callers are inside a block, e.g. waiting for or holding the render limit."""
+    gauge_add(name, 1)
+    try:
+        yield
+    finally:
+        gauge_add(name, -1)
+
+def register_stats(cache: str, stats: dict):
+    """Expose a module's counter dict (hits, misses, ...) as ai_video_cache_events_total{cache, event}."""
+    _stats[cache] = stats
+
+def register_gauge(name: str, function: Callable[[], float]):
+    _gauge_functions[name] = function
+
+def _hit_ratio(stats: dict) -> Optional[float]:
+    hits = sum(value for event, value in stats.items() if event.endswith("hits"))
+    misses = sum(value for event, value in stats.items() if event.endswith("misses"))
+    return hits / (hits + misses) if hits + misses else None
+
+def render() -> str:
+    """Prometheus text exposition of every histogram, gauge and registered cache counter."""
+    lines = [f"# TYPE {NAMESPACE}_stage_duration_seconds histogram"]
+    with _lock:
+        histograms = { stage: { **histogram, "buckets": list(histogram["buckets"]) } for stage, histogram in _histograms.items() }
+        gauges = dict(_gauges)
+    for stage, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram["buckets"]):
+            cumulative += count
+            lines.append(f'{NAMESPACE}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{NAMESPACE}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'{NAMESPACE}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+        lines.append(f'{NAMESPACE}_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+    lines.append(f"# TYPE {NAMESPACE}_cache_events_total counter")
+    for cache, stats in sorted(_stats.items()):
+        for event, value in sorted(stats.items()):
+            lines.append(f'{NAMESPACE}_cache_events_total{{cache="{cache}",event="{event}"}} {value}')
+    lines.append(f"# TYPE {NAMESPACE}_cache_hit_ratio gauge")
+    for cache, stats in sorted(_stats.items()):
+        ratio = _hit_ratio(stats)
+        if ratio is not None:
+            lines.append(f'{NAMESPACE}_cache_hit_ratio{{cache="{cache}"}} {ratio:.4f}')
+    for name, value in sorted({ **gauges, **{ name: function() for name, function in _gauge_functions.items() } }.items()):
+        lines.append(f"# TYPE {NAMESPACE}_{name} gauge")
+        lines.append(f"{NAMESPACE}_{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,123 @@
+import io
+import os
+import wave
+import ffmpeg
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Tuple
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+# Kokoro Speaks At 24 kHz, Files Without A WAV Header Are Decoded To This Rate
+FALLBACK_SAMPLE_RATE = 24000
+RESAMPLE_TAPS = 63
+
+_lock = threading.Lock()
+_arrays: OrderedDict = OrderedDict()
+_cached_bytes = 0
+stats = { "hits": 0, "misses": 0, "decodes": 0 }
+
+def get_cache_bytes() -> int:
+    return int(os.getenv("PCM_CACHE_MAX_BYTES", DEFAULT_CACHE_BYTES))
+
+def parse_wav(content: bytes) -> Tuple[np.ndarray, int]:
+    """Mono float32 samples and the sample rate of an integer PCM WAV file, without any subprocess."""
+    with wave.open(io.BytesIO(content)) as wav_file:
+        channels, sample_width, sample_rate = wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+    if sample_width not in (1, 2, 4) or (not frames and len(content) > 44):
+        # 24 Bit Samples Or A Streamed Header Without A Frame Count, ffmpeg Handles Those
+        raise wave.Error("Unsupported WAV layout")
+    if sample_width == 1:
+        samples = (np.frombuffer(frames, np.uint8).astype(np.float32) - 128) / 128
+    else:
+        dtype = np.int16 if sample_width == 2 else np.int32
+        samples = np.frombuffer(frames, dtype).astype(np.float32) / float(2 ** (8 * sample_width - 1))
+    if channels > 1:
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32), sample_rate
+
+def decode_with_ffmpeg(audio_file: str, sample_rate: int = FALLBACK_SAMPLE_RATE) -> np.ndarray:
+    """Decode any audio file ffmpeg understands (mp3 cache entries, uploads) to mono float32 samples."""
+    out, _ = (
+        ffmpeg
+        .input(audio_file)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=sample_rate)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def _store(key: str, audio: Tuple[np.ndarray, int]):
+    global _cached_bytes
+    audio[0].setflags(write=False)
+    with _lock:
+        if key in _arrays:
+            _cached_bytes -= _arrays.pop(key)[0].nbytes
+        _arrays[key] = audio
+        _cached_bytes += audio[0].nbytes
+        while _cached_bytes > get_cache_bytes() and len(_arrays) > 1:
+            _cached_bytes -= _arrays.popitem(last=False)[1][0].nbytes
+
+def remember(audio_file: str, content: bytes):
+    """Keep freshly synthesized WAV bytes as samples, so the transcriber and compositor never read the file back."""
+    try:
+        _store(os.path.abspath(audio_file), parse_wav(content))
+    except (wave.Error, EOFError):
+        pass
+
+def load(audio_file: str) -> Tuple[np.ndarray, int]:
+    """
+    Mono float32 samples and sample rate of an audio file, from memory when this process has seen it before.
+    WAV is read directly; other formats go through one ffmpeg decode. Arrays are shared, never write into them.
+    """
+    key = os.path.abspath(audio_file)
+    with _lock:
+        audio = _arrays.get(key)
+        if audio is not None:
+            _arrays.move_to_end(key)
+            stats["hits"] += 1
+            return audio
+        stats["misses"] += 1
+    with open(audio_file, "rb") as f:
+        content = f.read()
+    try:
+        audio = parse_wav(content)
+    except (wave.Error, EOFError):
+        stats["decodes"] += 1
+        audio = (decode_with_ffmpeg(audio_file), FALLBACK_SAMPLE_RATE)
+    _store(key, audio)
+    return audio
+
+def forget(directory: str):
+    """Drop the arrays of every file under a directory, e.g. a finished job's scratch."""
+    global _cached_bytes
+    prefix = os.path.join(os.path.abspath(directory), "")
+    with _lock:
+        for key in [key for key in _arrays if key.startswith(prefix)]:
+            _cached_bytes -= _arrays.pop(key)[0].nbytes
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Windowed-sinc low-pass when downsampling, then linear interpolation onto the target grid."""
+    if sample_rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < sample_rate:
+        cutoff = target_rate / sample_rate / 2
+        taps = np.arange(RESAMPLE_TAPS) - (RESAMPLE_TAPS - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(RESAMPLE_TAPS)
+        samples = np.convolve(samples, kernel / kernel.sum(), mode="same")
+    target_times = np.arange(int(len(samples) * target_rate / sample_rate)) / target_rate
+    return np.interp(target_times, np.arange(len(samples)) / sample_rate, samples).astype(np.float32)
+
+def load_resampled(audio_file: str, target_rate: int) -> np.ndarray:
+    samples, sample_rate = load(audio_file)
+    return resample(samples, sample_rate, target_rate)
+
+def duration(audio_file: str) -> float:
+    samples, sample_rate = load(audio_file)
+    return len(samples) / sample_rate
+
+def fit_length(samples: np.ndarray, length: int) -> np.ndarray:
+    """Trim or pad with silence to an exact sample count, e.g. the frame-rounded length of a rendered clip."""
+    if len(samples) >= length:
+        return samples[:length]
+    return np.concatenate([samples, np.zeros(length - len(samples), np.float32)])
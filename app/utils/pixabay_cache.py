@@ -0,0 +1,152 @@
+import os
+import json
+import hashlib
+import asyncio
+from time import time
+from collections import OrderedDict
+from typing import Optional
+from . import http_client, metrics
+
+DEFAULT_SEARCH_TTL = 24 * 60 * 60
+DEFAULT_ASSET_CACHE_BYTES = 5 * 1024 * 1024 * 1024
+DEFAULT_SEARCH_CACHE_BYTES = 64 * 1024 * 1024
+# Search Responses Kept In Memory, The Disk Copy Serves The Rest
+MAX_MEMORY_SEARCHES = 1024
+# Assets Used This Recently May Still Be Read By A Running Job, Eviction Leaves Them Alone
+ASSET_GRACE_SECONDS = 60 * 60
+
+_searches: OrderedDict = OrderedDict()
+_inflight: dict = {}
+stats = { "search_hits": 0, "search_misses": 0, "asset_hits": 0, "asset_misses": 0, "joined": 0, "evictions": 0 }
+
+def get_cache_dir(kind: str) -> str:
+    cache_dir = os.path.join(os.getenv("PIXABAY_CACHE_DIR", os.path.join("cache", "pixabay")), kind)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def get_search_ttl() -> int:
+    return int(os.getenv("PIXABAY_SEARCH_TTL", DEFAULT_SEARCH_TTL))
+
+def get_asset_cache_bytes() -> int:
+    return int(os.getenv("PIXABAY_ASSET_CACHE_MAX_BYTES", DEFAULT_ASSET_CACHE_BYTES))
+
+def get_search_cache_bytes() -> int:
+    return int(os.getenv("PIXABAY_SEARCH_CACHE_MAX_BYTES", DEFAULT_SEARCH_CACHE_BYTES))
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+def _read_search(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _write_search(path: str, cached: dict):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(cached, f)
+    os.replace(temp_path, path)
+
+def _evict(cache_dir: str, max_bytes: int, expired_before: float = 0, keep_after: float = float("inf")):
+    """
+    Drop files last used before expired_before, then least recently used files above max_bytes.
+    Files used after keep_after are never dropped. Blocking.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        # In Flight Downloads And Writes
+        if name.endswith((".part", ".tmp")):
+            continue
+        try:
+            entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+        except FileNotFoundError:
+            continue
+    total_size = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if mtime >= keep_after or (mtime >= expired_before and total_size <= max_bytes):
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+        stats["evictions"] += 1
+
+def _remember_search(key: str, cached: dict):
+    _searches[key] = cached
+    _searches.move_to_end(key)
+    now = time()
+    # Oldest First, So Expired Entries And Those Over The Bound Both Sit At The Front
+    while _searches:
+        oldest_key, oldest = next(iter(_searches.items()))
+        if len(_searches) <= MAX_MEMORY_SEARCHES and now - oldest["at"] < get_search_ttl():
+            break
+        del _searches[oldest_key]
+
+async def _single_flight(key: str, factory):
+    """Run factory once per key; concurrent callers for the same key await the same result."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        stats["joined"] += 1
+    return await asyncio.shield(task)
+
+async def search(url: str, query: str, media_type: str, orientation: str = "", extra_params: Optional[dict] = None) -> dict:
+    """Pixabay search keyed by query, media type and orientation, served from cache until the TTL expires."""
+    key = _hash(json.dumps([query, media_type, orientation, extra_params or {}]))
+    path = os.path.join(get_cache_dir("search"), f"{key}.json")
+    cached = _searches.get(key) or await asyncio.to_thread(_read_search, path)
+    if cached is not None and time() - cached["at"] < get_search_ttl():
+        _remember_search(key, cached)
+        stats["search_hits"] += 1
+        return cached["data"]
+    stats["search_misses"] += 1
+
+    async def fetch():
+        params = { "key": os.getenv("PIXABAY_API_KEY"), "q": query, **(extra_params or {}) }
+        if orientation:
+            params["orientation"] = orientation
+        async with metrics.span("pixabay_search"):
+            data = await http_client.get_json(url, params=params)
+        fetched = { "at": time(), "data": data }
+        _remember_search(key, fetched)
+        await asyncio.to_thread(_write_search, path, fetched)
+        # Search Files Are Written Once, Their mtime Is The Time The Response Was Fetched
+        await asyncio.to_thread(_evict, os.path.dirname(path), get_search_cache_bytes(), expired_before=time() - get_search_ttl())
+        return data
+
+    return await _single_flight(f"search:{key}", fetch)
+
+async def fetch_asset(url: str, extension: str, timeout: float = http_client.DEFAULT_TIMEOUT) -> str:
+    """Download a hit once, stored by URL hash and shared by every job that picks the same asset."""
+    path = os.path.join(get_cache_dir("assets"), f"{_hash(url)}.{extension}")
+    if os.path.exists(path):
+        try:
+            # Touch So Eviction Treats It As Recently Used
+            os.utime(path)
+            stats["asset_hits"] += 1
+            return path
+        except FileNotFoundError:
+            pass
+    stats["asset_misses"] += 1
+
+    async def download():
+        # Download Beside The Final Name So A Half Written File Is Never Served
+        temp_path = f"{path}.part"
+        try:
+            async with metrics.span("download"):
+                await http_client.download(url, temp_path, timeout=timeout)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        await asyncio.to_thread(_evict, os.path.dirname(path), get_asset_cache_bytes(), keep_after=time() - ASSET_GRACE_SECONDS)
+        return path
+
+    return await _single_flight(f"asset:{path}", download)
@@ -0,0 +1,55 @@
+from typing import Optional
+
+# Landscape Frame Sizes, Portrait Swaps Them And Square Uses The Short Side Twice
+PROFILES = {
+    # Quick Preview While Iterating On Text: Same Timeline And Captions, A Fraction Of The Pixels And Frames
+    "draft": { "width": 854, "height": 480, "fps": 12, "preset": "ultrafast", "crf": 30, "threads": 2 },
+    "standard": { "width": 1920, "height": 1080, "fps": 24, "preset": "medium", "crf": 23, "threads": 0 },
+    "final": { "width": 1920, "height": 1080, "fps": 30, "preset": "slow", "crf": 18, "threads": 0 },
+}
+DEFAULT_PROFILE = "standard"
+ORIENTATIONS = ("landscape", "portrait", "square")
+DEFAULT_ORIENTATION = "landscape"
+# Caption Sizes And Margins Are Designed For A 1080 Pixel Short Side
+CAPTION_REFERENCE_SIZE = 1080
+# One Keyframe About Every 10 Seconds Whatever The Frame Rate, HLS Segments Are Cut On Them
+KEYFRAME_SECONDS = 10
+
+def resolve(name: str = DEFAULT_PROFILE, orientation: Optional[str] = DEFAULT_ORIENTATION) -> dict:
+    """The named profile with its frame size turned to the requested orientation. Raises ValueError for unknown names."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile '{name}', use one of {', '.join(PROFILES)}")
+    orientation = (orientation or DEFAULT_ORIENTATION).lower()
+    if orientation not in ORIENTATIONS:
+        raise ValueError(f"Unknown orientation '{orientation}', use one of {', '.join(ORIENTATIONS)}")
+    profile = { "name": name, "orientation": orientation, **PROFILES[name] }
+    if orientation == "portrait":
+        profile["width"], profile["height"] = profile["height"], profile["width"]
+    elif orientation == "square":
+        profile["width"] = profile["height"]
+    return profile
+
+def caption_scale(width: int, height: int) -> float:
+    return min(width, height) / CAPTION_REFERENCE_SIZE
+
+def keyframe_interval(profile: dict) -> int:
+    return profile["fps"] * KEYFRAME_SECONDS
+
+def moviepy_params(profile: dict) -> dict:
+    """Keyword arguments for MoviePy's write_videofile."""
+    return {
+        "fps": profile["fps"],
+        "preset": profile["preset"],
+        "threads": profile["threads"] or None,
+        "ffmpeg_params": ["-crf", str(profile["crf"]), "-g", str(keyframe_interval(profile))],
+    }
+
+def ffmpeg_params(profile: dict) -> dict:
+    """Output options for an ffmpeg-python libx264 encode."""
+    return {
+        "r": profile["fps"],
+        "preset": profile["preset"],
+        "crf": profile["crf"],
+        "g": keyframe_interval(profile),
+        "threads": profile["threads"],
+    }
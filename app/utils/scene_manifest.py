@@ -0,0 +1,98 @@
+import os
+import json
+import shutil
+import hashlib
+from time import time
+from typing import List, Optional
+from . import workspace
+
+MANIFEST_NAME = "manifest.json"
+SCENES_DIR = "scenes"
+# Bump When A Change To The Renderer Makes Old Scene Segments Stale
+MANIFEST_VERSION = 1
+
+# Hits Are Scenes Linked From A Base Job, Misses Scenes Rendered Again
+stats = { "hits": 0, "misses": 0, "assets_reused": 0 }
+
+def scene_hash(**fields) -> str:
+    """Content hash of everything that changes a rendered scene: text, voice, caption and font settings, assets and render profile."""
+    return hashlib.sha256(json.dumps([MANIFEST_VERSION, fields], sort_keys=True).encode()).hexdigest()
+
+def manifest_path(job_id: str) -> str:
+    return os.path.join(workspace.OUTPUT_DIR, job_id, MANIFEST_NAME)
+
+def load(job_id: str) -> Optional[dict]:
+    """The manifest a finished job left in its output directory, or None once it was collected or never written."""
+    # Job Ids Are Generated By uuid4().hex, Anything Else Would Escape The Output Directory
+    if not job_id or not job_id.isalnum():
+        return None
+    try:
+        with open(manifest_path(job_id)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def write(job_id: str, manifest: dict):
+    path = manifest_path(job_id)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({ **manifest, "version": MANIFEST_VERSION, "job_id": job_id, "written_at": time() }, f)
+    os.replace(temp_path, path)
+
+def link_file(source: str, target: str) -> str:
+    """Give a file a second name without copying it; the link outlives the source job's garbage collection."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+    return target
+
+def scenes_by_text(manifest: Optional[dict]) -> dict:
+    """Scene entries of a manifest keyed by their text, so inserted or reordered scenes still find their match."""
+    if manifest is None or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return { scene["text"]: scene for scene in manifest.get("scenes", []) }
+
+def sentence_count(text: str) -> int:
+    # Scenes Are Narrated And Illustrated Per Sentence, Split The Same Way As The Generation Pipeline Does
+    return len(text.split(". "))
+
+def match_scenes(manifest: Optional[dict], all_text: List[str], type: str) -> List[Optional[dict]]:
+    """
+    The base scene of every new scene text: the one with the same text, else an edited scene at the same position,
+    i.e. one whose text is no longer in the job and that has as many sentences. Edited matches share the search query
+    and assets, never the segments. A base job of another type matches nothing, its assets are of the wrong kind.
+    """
+    base_scenes = scenes_by_text(manifest)
+    if not base_scenes or manifest.get("type") != type:
+        return [None] * len(all_text)
+    base_scene_list = manifest["scenes"]
+    all_text_set = set(all_text)
+
+    def position_match(index: int, text: str) -> Optional[dict]:
+        if index >= len(base_scene_list):
+            return None
+        base_scene = base_scene_list[index]
+        if base_scene["text"] in all_text_set or sentence_count(base_scene["text"]) != sentence_count(text):
+            return None
+        return base_scene
+
+    return [base_scenes.get(text) or position_match(index, text) for index, text in enumerate(all_text)]
+
+def reuse_scene(scene: dict, source_job_id: str, target_dir: str) -> Optional[dict]:
+    """
+    Link a manifest scene's segments and narration into another job's scenes directory.
+    Returns the entry with the new file names, or None when any of its files is gone.
+    """
+    source_dir = os.path.join(workspace.OUTPUT_DIR, source_job_id, SCENES_DIR)
+    file_names: List[str] = [*scene["videos"], *scene["audios"]]
+    try:
+        for file_name in file_names:
+            link_file(os.path.join(source_dir, file_name), os.path.join(target_dir, file_name))
+    except FileNotFoundError:
+        # The Base Job Was Collected In The Meantime
+        return None
+    stats["hits"] += 1
+    return dict(scene)
@@ -0,0 +1,151 @@
+import os
+import uuid
+import ffmpeg
+import hashlib
+import asyncio
+import threading
+from collections import Counter
+from typing import List, Optional
+from fastapi import UploadFile
+
+CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_UPLOAD_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024 * 1024
+
+_probes: dict = {}
+# Stored Uploads A Request Has Ingested But Not Finished Rendering, Eviction Never Touches Them
+_lock = threading.Lock()
+_in_use: Counter = Counter()
+stats = { "ingested": 0, "deduplicated": 0, "rejected": 0, "evictions": 0 }
+
+class UploadRejectedError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+def get_store_dir() -> str:
+    store_dir = os.getenv("UPLOAD_STORE_DIR", os.path.join("cache", "uploads"))
+    os.makedirs(store_dir, exist_ok=True)
+    return store_dir
+
+def get_max_upload_bytes() -> int:
+    return int(os.getenv("UPLOAD_MAX_BYTES", DEFAULT_MAX_UPLOAD_BYTES))
+
+def get_max_bytes() -> int:
+    return int(os.getenv("UPLOAD_STORE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+def _extension(file_name: Optional[str]) -> str:
+    extension = os.path.splitext(file_name or "")[1].lower()
+    return extension if extension[1:].isalnum() else ""
+
+def probe_video(path: str) -> dict:
+    """Read container metadata with ffprobe, no frame is decoded. Raises UploadRejectedError for anything without a usable video stream."""
+    try:
+        info = ffmpeg.probe(path)
+    except ffmpeg.Error:
+        raise UploadRejectedError("Uploaded File Is Not A Readable Media Container")
+    video = next((stream for stream in info.get("streams", []) if stream.get("codec_type") == "video"), None)
+    if video is None or not video.get("width") or not video.get("height"):
+        raise UploadRejectedError("Uploaded File Has No Video Stream")
+    duration = float(info.get("format", {}).get("duration") or video.get("duration") or 0)
+    if duration <= 0:
+        raise UploadRejectedError("Uploaded Video Has No Duration")
+    return { "width": int(video["width"]), "height": int(video["height"]), "duration": duration, "codec": video.get("codec_name") }
+
+def acquire(path: str):
+    with _lock:
+        _in_use[path] += 1
+
+def release(paths: List[str]):
+    """Let eviction have stored uploads again once the request that ingested them is done with them."""
+    with _lock:
+        for path in paths:
+            _in_use[path] -= 1
+            if _in_use[path] <= 0:
+                del _in_use[path]
+
+def _evict():
+    """Drop least recently used uploads above the store size bound, sparing those still in use. Blocking."""
+    store_dir = get_store_dir()
+    with _lock:
+        in_use = set(_in_use)
+    entries = []
+    for name in os.listdir(store_dir):
+        path = os.path.join(store_dir, name)
+        if name.endswith(".part") or not os.path.isfile(path) or path in in_use:
+            continue
+        try:
+            entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+        except FileNotFoundError:
+            continue
+    # Files In Use Count Towards The Bound, They Are Only Never The Ones Removed
+    total_size = sum(size for _, size, _ in entries) + sum(os.path.getsize(path) for path in in_use if os.path.exists(path))
+    for _, size, path in sorted(entries):
+        if total_size <= get_max_bytes():
+            break
+        with _lock:
+            # Acquired By Another Request Since The Listing
+            if path in _in_use:
+                continue
+            os.remove(path)
+        _probes.pop(path, None)
+        total_size -= size
+        stats["evictions"] += 1
+
+def _write_chunk(file, digest, chunk: bytes):
+    # Hashing Runs Beside The Write In The Worker Thread, hashlib Releases The GIL On Large Buffers
+    digest.update(chunk)
+    file.write(chunk)
+
+async def ingest(upload: UploadFile) -> dict:
+    """
+    Stream an upload into the content-addressed store, hashing it while it is written, and validate it with ffprobe.
+    Returns {"path", "sha256", "deduplicated", **probe}. The stored file is shared, callers must not delete it,
+    and it is held against eviction until the caller passes it to release().
+    """
+    store_dir = get_store_dir()
+    temp_path = os.path.join(store_dir, f"{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as file:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > get_max_upload_bytes():
+                    raise UploadRejectedError(f"Uploaded File Is Larger Than {get_max_upload_bytes()} Bytes", status_code=413)
+                await asyncio.to_thread(_write_chunk, file, digest, chunk)
+        if size == 0:
+            raise UploadRejectedError("Uploaded File Is Empty")
+        sha256 = digest.hexdigest()
+        path = os.path.join(store_dir, f"{sha256}{_extension(upload.filename)}")
+        # Held Before It Exists Under Its Final Name, So A Concurrent Eviction Cannot Take It
+        acquire(path)
+        try:
+            deduplicated = os.path.exists(path)
+            if deduplicated:
+                os.remove(temp_path)
+                # Touch So Eviction Treats It As Recently Used
+                os.utime(path)
+            else:
+                probe = await asyncio.to_thread(probe_video, temp_path)
+                os.replace(temp_path, path)
+                _probes[path] = probe
+                await asyncio.to_thread(_evict)
+            probe = _probes.get(path)
+            if probe is None:
+                probe = await asyncio.to_thread(probe_video, path)
+                _probes[path] = probe
+        except BaseException:
+            release([path])
+            raise
+    except UploadRejectedError:
+        stats["rejected"] += 1
+        raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    stats["deduplicated" if deduplicated else "ingested"] += 1
+    return { "path": path, "sha256": sha256, "deduplicated": deduplicated, **probe }
@@ -0,0 +1,37 @@
+import logging
+import asyncio
+from time import time, perf_counter
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_state = { "ready": False, "started_at": None, "finished_at": None, "steps": {}, "error": None }
+
+def status() -> dict:
+    return { **_state, "steps": dict(_state["steps"]) }
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+def mark_ready():
+    _state["ready"] = True
+    _state["finished_at"] = time()
+
+async def run(steps: List[Tuple[str, Callable[[], object]]]):
+    """
+    Run blocking warm-up steps one after another in a worker thread, recording how long each took.
+    The process only reports ready once every step succeeded; a failing step is kept as the error.
+    """
+    _state["started_at"] = time()
+    for name, step in steps:
+        start = perf_counter()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            logger.exception(f"Warm-up step '{name}' failed")
+            _state["error"] = f"{name}: {e}"
+            _state["finished_at"] = time()
+            return
+        _state["steps"][name] = round(perf_counter() - start, 3)
+        logger.info(f"Warm-up step '{name}' took {_state['steps'][name]}s")
+    mark_ready()
@@ -0,0 +1,127 @@
+import os
+import logging
+import threading
+from typing import List
+from . import pcm_audio
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WHISPER_MODEL = "base"
+ENGINE_OPENAI_WHISPER = "openai-whisper"
+ENGINE_FASTER_WHISPER = "faster-whisper"
+DEFAULT_ENGINE = ENGINE_OPENAI_WHISPER
+DEFAULT_COMPUTE_TYPE = "int8"
+# Both Engines Take 16 kHz Mono float32 Samples In Place Of A File Path
+WHISPER_SAMPLE_RATE = 16000
+
+_model = None
+_model_name = None
+# Loading And Transcribing Are Guarded Separately So A Reload Never Races A Running Transcription
+_load_lock = threading.Lock()
+_transcribe_lock = threading.Lock()
+
+def get_model_name() -> str:
+    return os.getenv("WHISPER_MODEL", DEFAULT_WHISPER_MODEL)
+
+def get_engine_name() -> str:
+    engine = os.getenv("TRANSCRIPTION_ENGINE", DEFAULT_ENGINE)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown transcription engine '{engine}', use one of {', '.join(ENGINES)}")
+    return engine
+
+def get_thread_count() -> int:
+    """CPU threads per transcription, 0 keeps the runtime's default."""
+    return max(0, int(os.getenv("TRANSCRIPTION_THREADS") or 0))
+
+def get_compute_type() -> str:
+    return os.getenv("TRANSCRIPTION_COMPUTE_TYPE", DEFAULT_COMPUTE_TYPE)
+
+def load_openai_whisper(name: str):
+    # Imported Here, torch And whisper Take Seconds To Import And Most Requests Never Transcribe
+    import torch
+    import whisper
+    if get_thread_count():
+        torch.set_num_threads(get_thread_count())
+    return whisper.load_model(name)
+
+def transcribe_openai_whisper(model, audio) -> dict:
+    result = model.transcribe(audio, word_timestamps=True)
+    return { "text": result["text"], "segments": result["segments"] }
+
+def load_faster_whisper(name: str):
+    """The same Whisper weights converted for CTranslate2, quantized to int8 for the CPU by default."""
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise RuntimeError("The faster-whisper transcription engine needs the faster-whisper package, install it with pip install -r requirements-faster-whisper.txt")
+    return WhisperModel(name, device="cpu", compute_type=get_compute_type(), cpu_threads=get_thread_count())
+
+def transcribe_faster_whisper(model, audio) -> dict:
+    """Transcribe with faster-whisper and return segments in openai-whisper's shape, words included."""
+    segments, _ = model.transcribe(audio, word_timestamps=True)
+    all_segment = []
+    for segment in segments:
+        all_segment.append({
+            "id": segment.id,
+            "seek": segment.seek,
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text,
+            "tokens": list(segment.tokens),
+            "temperature": segment.temperature,
+            "avg_logprob": segment.avg_logprob,
+            "compression_ratio": segment.compression_ratio,
+            "no_speech_prob": segment.no_speech_prob,
+            "words": [{ "word": word.word, "start": word.start, "end": word.end, "probability": word.probability } for word in segment.words or []],
+        })
+    return { "text": "".join(segment["text"] for segment in all_segment), "segments": all_segment }
+
+ENGINES = {
+    ENGINE_OPENAI_WHISPER: { "load": load_openai_whisper, "transcribe": transcribe_openai_whisper },
+    ENGINE_FASTER_WHISPER: { "load": load_faster_whisper, "transcribe": transcribe_faster_whisper },
+}
+
+def get_whisper_model():
+    """Return the process-wide model of the configured transcription engine, loading it once on first use."""
+    global _model, _model_name
+    name = (get_engine_name(), get_model_name())
+    if _model is not None and _model_name == name:
+        return _model
+    with _load_lock:
+        if _model is None or _model_name != name:
+            logger.info(f"Loading Whisper model '{name[1]}' with the {name[0]} engine")
+            _model = ENGINES[name[0]]["load"](name[1])
+            _model_name = name
+    return _model
+
+def preload_whisper_model():
+    """Load the configured model ahead of the first request, unless WHISPER_PRELOAD is disabled."""
+    if os.getenv("WHISPER_PRELOAD", "true").lower() in ("0", "false", "no"):
+        return None
+    return get_whisper_model()
+
+def transcribe_audio_files(audios: List[str]) -> List[dict]:
+    """Transcribe audio files with the shared model. Blocking, call it from a worker thread."""
+    for audio_file in audios:
+        if not os.path.exists(audio_file):
+            print(f"File not found! {audio_file}")
+            raise FileNotFoundError(f"The file {audio_file} does not exist.")
+    model = get_whisper_model()
+    transcribe = ENGINES[get_engine_name()]["transcribe"]
+    transcriptions = []
+    with _transcribe_lock:
+        for audio_file in audios:
+            # Samples Come From Memory, Whisper Does Not Run Its Own ffmpeg Decode
+            transcriptions.append({ "file": audio_file, **transcribe(model, pcm_audio.load_resampled(audio_file, WHISPER_SAMPLE_RATE)) })
+    return transcriptions
+
+def transcribe_audio_batches(batches: List[List[str]]) -> List[List[dict]]:
+    """Transcribe every scene of a job in one pass under a single lock hold and split the result back per scene."""
+    flat_audios = [audio_file for batch in batches for audio_file in batch]
+    flat_transcriptions = transcribe_audio_files(flat_audios)
+    results = []
+    offset = 0
+    for batch in batches:
+        results.append(flat_transcriptions[offset:offset + len(batch)])
+        offset += len(batch)
+    return results
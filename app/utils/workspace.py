@@ -0,0 +1,119 @@
+import os
+import uuid
+import shutil
+import threading
+from time import time
+from typing import Optional
+
+# Served As /public, Every Job Publishes Into Its Own Sub Directory
+OUTPUT_DIR = "temp_videos"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024 * 1024
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+_lock = threading.Lock()
+_active: set = set()
+stats = { "evictions": 0, "evicted_bytes": 0, "orphans_removed": 0 }
+
+def get_scratch_root() -> str:
+    """Where intermediates live; point WORKSPACE_SCRATCH_DIR at a tmpfs such as /dev/shm to keep them off the disk."""
+    return os.getenv("WORKSPACE_SCRATCH_DIR", "temp_work")
+
+def get_max_bytes() -> int:
+    return int(os.getenv("WORKSPACE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+def get_max_age() -> int:
+    return int(os.getenv("WORKSPACE_MAX_AGE", DEFAULT_MAX_AGE))
+
+class Workspace:
+    """
+    The files of one job: intermediates in a scratch directory that is removed when the job ends,
+    and published outputs in OUTPUT_DIR/{id}, pinned against garbage collection while the job runs.
+    """
+
+    def __init__(self, workspace_id: Optional[str] = None):
+        self.id = workspace_id or uuid.uuid4().hex
+        self.scratch_dir = os.path.join(get_scratch_root(), self.id)
+        self.output_dir = os.path.join(OUTPUT_DIR, self.id)
+        with _lock:
+            _active.add(self.id)
+        os.makedirs(self.scratch_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def scratch(self, name: str) -> str:
+        """A scratch sub directory, created on first use."""
+        path = os.path.join(self.scratch_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def output_path(self, file_name: str) -> str:
+        return os.path.join(self.output_dir, file_name)
+
+    def public_name(self, file_name: str) -> str:
+        """Path of an output relative to /public."""
+        return f"{self.id}/{file_name}"
+
+    def close(self):
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        with _lock:
+            _active.discard(self.id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _entry_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, file_name)) for root, _, files in os.walk(path) for file_name in files)
+    return os.path.getsize(path)
+
+def _remove(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def collect_garbage() -> dict:
+    """
+    Evict published outputs older than the age limit, then the oldest ones until the total fits the size quota.
+    Outputs of running jobs are never evicted. Blocking, run it in a worker thread.
+    """
+    now = time()
+    max_age = get_max_age()
+    with _lock:
+        active = set(_active)
+    entries = []
+    total_size = 0
+    if os.path.isdir(OUTPUT_DIR):
+        for name in os.listdir(OUTPUT_DIR):
+            path = os.path.join(OUTPUT_DIR, name)
+            try:
+                size = _entry_size(path)
+                modified_at = os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+            total_size += size
+            if name not in active:
+                entries.append((modified_at, size, path))
+    for modified_at, size, path in sorted(entries):
+        if total_size <= get_max_bytes() and now - modified_at <= max_age:
+            break
+        _remove(path)
+        total_size -= size
+        stats["evictions"] += 1
+        stats["evicted_bytes"] += size
+
+    # Scratch Left Behind By A Crashed Process; The Age Check Spares Other Workers Sharing The Directory
+    scratch_root = get_scratch_root()
+    if os.path.isdir(scratch_root):
+        for name in os.listdir(scratch_root):
+            path = os.path.join(scratch_root, name)
+            try:
+                stale = name not in active and now - os.path.getmtime(path) > max_age
+            except FileNotFoundError:
+                continue
+            if stale:
+                _remove(path)
+                stats["orphans_removed"] += 1
+    return { "total_bytes": total_size, **stats }
@@ -0,0 +1,170 @@
+"""
+End-to-end /api/generate-ai/jobs benchmark against local API stubs, no network access needed.
+
+Starts benchmarks.stub_servers and the real app (uvicorn app.main:app) in subprocesses, submits
+1, 5 and 20 scene jobs at several concurrency levels and writes a JSON report with per-stage
+latency, wall time, peak RSS of the app process and output size for every run.
+
+Usage: python -m benchmarks.e2e_benchmark [--scenes 1 5 20] [--concurrency 1 2 4] [--output report.json]
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import httpx
+from time import time, sleep, perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import workspace
+from benchmarks.parallel_render_benchmark import EXAMPLE_TEXTS
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_PORT = 8990
+APP_PORT = 8991
+POLL_SECONDS = 0.5
+JOB_TIMEOUT_SECONDS = 3600
+
+def wait_for(url: str, timeout: float = 120.0):
+    deadline = time() + timeout
+    while time() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        sleep(0.2)
+    raise TimeoutError(f"{url} did not become ready within {timeout}s")
+
+def peak_rss_mb(pid: int) -> float:
+    """High-water mark of the resident set of a process (Linux), 0 where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except FileNotFoundError:
+        pass
+    return 0.0
+
+def start_app(state_dir: str, concurrency: int, caption_timing: str) -> subprocess.Popen:
+    stub_url = f"http://127.0.0.1:{STUB_PORT}"
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_MODEL": "gpt-4o-mini",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "PIXABAY_API_KEY": "stub",
+        "PIXABAY_API_BASE_URL": f"{stub_url}/pixabay",
+        "TTS_BASE_URL": f"{stub_url}/v1/audio",
+        "GENERATE_AI_WORKERS": str(concurrency),
+        "GENERATE_AI_MAX_QUEUED": "1000",
+        # Fresh State Per Run, So Every Run Starts With Cold Caches
+        "JOB_STORE_DIR": os.path.join(state_dir, "jobs"),
+        "AUDIO_CACHE_DIR": os.path.join(state_dir, "tts"),
+        "PIXABAY_CACHE_DIR": os.path.join(state_dir, "pixabay"),
+        "LLM_CACHE_DIR": os.path.join(state_dir, "llm"),
+        "WORKSPACE_SCRATCH_DIR": os.path.join(state_dir, "work"),
+        "WHISPER_PRELOAD": "true" if caption_timing == "whisper" else "false",
+    }
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(APP_PORT), "--log-level", "warning"], cwd=ROOT_DIR, env=env)
+    wait_for(f"http://127.0.0.1:{APP_PORT}/ready", timeout=600.0)
+    return process
+
+def job_form(scene_count: int, caption_timing: str) -> dict:
+    scenes = [f"Scene {index + 1}: {EXAMPLE_TEXTS[index % len(EXAMPLE_TEXTS)]}" for index in range(scene_count)]
+    return {
+        "type": "image", "voice": "af_bella", "array_text": json.dumps(scenes), "duration_total": str(scene_count * 15), "duration_per_scene": "15",
+        "orientation": "landscape", "font_size": "30", "font_color": "white", "transition": "fade", "caption_timing": caption_timing,
+        "include_timings": "true",
+    }
+
+def stage_latencies(job: dict) -> dict:
+    """Seconds spent in each recorded stage, from the job store's stage history."""
+    stages = job.get("stages", [])
+    latencies = {}
+    for stage, next_stage in zip(stages, stages[1:]):
+        latencies[stage["stage"]] = round(latencies.get(stage["stage"], 0) + next_stage["at"] - stage["at"], 3)
+    return latencies
+
+def run_level(scene_count: int, concurrency: int, caption_timing: str) -> dict:
+    base_url = f"http://127.0.0.1:{APP_PORT}"
+    with tempfile.TemporaryDirectory() as state_dir:
+        process = start_app(state_dir, concurrency, caption_timing)
+        try:
+            start = perf_counter()
+            job_ids = []
+            for _ in range(concurrency):
+                response = httpx.post(f"{base_url}/api/generate-ai/jobs", data=job_form(scene_count, caption_timing), timeout=60.0)
+                response.raise_for_status()
+                job_ids.append(response.json()["data"]["job_id"])
+            jobs = {}
+            deadline = time() + JOB_TIMEOUT_SECONDS
+            while len(jobs) < len(job_ids) and time() < deadline:
+                for job_id in job_ids:
+                    if job_id in jobs:
+                        continue
+                    status = httpx.get(f"{base_url}/api/generate-ai/jobs/{job_id}", timeout=10.0).json()["data"]
+                    if status["status"] in ("completed", "failed"):
+                        with open(os.path.join(state_dir, "jobs", f"{job_id}.json")) as f:
+                            jobs[job_id] = { **json.load(f), "finished_after": perf_counter() - start }
+                sleep(POLL_SECONDS)
+            wall_time = perf_counter() - start
+            peak_rss = peak_rss_mb(process.pid)
+        finally:
+            process.terminate()
+            process.wait()
+
+    runs = []
+    for job_id in job_ids:
+        job = jobs.get(job_id, { "status": "timeout" })
+        output_dir = os.path.join(ROOT_DIR, workspace.OUTPUT_DIR, job_id)
+        output_bytes = sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir) if name.endswith(".mp4")) if os.path.isdir(output_dir) else 0
+        shutil.rmtree(output_dir, ignore_errors=True)
+        runs.append({
+            "job_id": job_id,
+            "status": job["status"],
+            "error": job.get("error"),
+            "latency_s": round(job.get("finished_after", 0), 2),
+            "stage_latency_s": stage_latencies(job),
+            "stage_timings": job.get("timings"),
+            "output_bytes": output_bytes,
+        })
+    return {
+        "scenes": scene_count,
+        "concurrency": concurrency,
+        "wall_time_s": round(wall_time, 2),
+        "peak_rss_mb": peak_rss,
+        "jobs": runs,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--caption-timing", default="aligned-from-source", choices=["aligned-from-source", "whisper"])
+    parser.add_argument("--output", default=None, help="Write the report to this file as well as stdout")
+    args = parser.parse_args()
+
+    stubs = subprocess.Popen([sys.executable, "-m", "benchmarks.stub_servers", str(STUB_PORT)], cwd=ROOT_DIR)
+    try:
+        wait_for(f"http://127.0.0.1:{STUB_PORT}/docs")
+        report = {
+            "caption_timing": args.caption_timing,
+            "started_at": time(),
+            "runs": [run_level(scene_count, concurrency, args.caption_timing) for scene_count in args.scenes for concurrency in args.concurrency],
+        }
+    finally:
+        stubs.terminate()
+        stubs.wait()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
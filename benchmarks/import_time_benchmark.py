@@ -0,0 +1,40 @@
+"""
+Import cost of the app and of its heavy dependencies, each measured in a fresh interpreter
+with python -X importtime so nothing is shared between measurements.
+
+Usage: python -m benchmarks.import_time_benchmark
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_MODULES = ["app.main", "app.routes.generate_ai", "app.routes.movie", "app.routes.text_to_speech", "app.routes.generate_video"]
+DEPENDENCY_MODULES = ["fastapi", "httpx", "numpy", "PIL.Image", "ffmpeg", "openai", "moviepy", "whisper", "torch"]
+TOP_IMPORTS = 10
+
+def measure(module: str) -> dict:
+    """Cumulative import time of a module plus its costliest transitive imports, in milliseconds."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return { "error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed" }
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_us), int(self_us), name))
+    total = next((cumulative for cumulative, _, name in imports if name.strip() == module), max(cumulative for cumulative, _, _ in imports))
+    heaviest = sorted(imports, reverse=True)[:TOP_IMPORTS]
+    return {
+        "cumulative_ms": round(total / 1000, 1),
+        "heaviest": [{ "module": name.strip(), "cumulative_ms": round(cumulative / 1000, 1) } for cumulative, _, name in heaviest],
+    }
+
+def main():
+    report = { module: measure(module) for module in APP_MODULES + DEPENDENCY_MODULES }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
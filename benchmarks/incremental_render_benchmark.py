@@ -0,0 +1,73 @@
+"""
+Cost of editing one scene of a job: a full re-render versus an incremental re-render from the
+first job's scene manifest, both against the local API stubs with warm caches.
+
+Usage: python -m benchmarks.incremental_render_benchmark [--scenes 10] [--render-profile draft]
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import httpx
+from time import sleep, perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import workspace
+from benchmarks.e2e_benchmark import ROOT_DIR, STUB_PORT, APP_PORT, POLL_SECONDS, wait_for, start_app, job_form
+
+def run_job(form: dict) -> dict:
+    base_url = f"http://127.0.0.1:{APP_PORT}"
+    start = perf_counter()
+    response = httpx.post(f"{base_url}/api/generate-ai/jobs", data=form, timeout=60.0)
+    response.raise_for_status()
+    job_id = response.json()["data"]["job_id"]
+    while True:
+        status = httpx.get(f"{base_url}/api/generate-ai/jobs/{job_id}", timeout=10.0).json()["data"]
+        if status["status"] in ("completed", "failed"):
+            return { "job_id": job_id, "status": status["status"], "error": status["error"], "latency_s": round(perf_counter() - start, 2) }
+        sleep(POLL_SECONDS)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=10)
+    parser.add_argument("--render-profile", default="standard")
+    args = parser.parse_args()
+
+    form = { **job_form(args.scenes, "aligned-from-source"), "render_profile": args.render_profile }
+    scenes = json.loads(form["array_text"])
+    # Appending A Sentence Changes The Sentence Count, So The Edited Scene Is Searched, Fetched And Rendered Anew
+    edited_form = { **form, "array_text": json.dumps([*scenes[:-1], f"{scenes[-1]} The day ends with a long nap."]) }
+
+    stubs = subprocess.Popen([sys.executable, "-m", "benchmarks.stub_servers", str(STUB_PORT)], cwd=ROOT_DIR)
+    try:
+        wait_for(f"http://127.0.0.1:{STUB_PORT}/docs")
+        with tempfile.TemporaryDirectory() as state_dir:
+            app = start_app(state_dir, 1, "aligned-from-source")
+            try:
+                first = run_job(form)
+                full = run_job(edited_form)
+                incremental = run_job({ **edited_form, "base_job_id": first["job_id"] })
+            finally:
+                app.terminate()
+                app.wait()
+    finally:
+        stubs.terminate()
+        stubs.wait()
+    for job in (first, full, incremental):
+        shutil.rmtree(os.path.join(ROOT_DIR, workspace.OUTPUT_DIR, job["job_id"]), ignore_errors=True)
+    print(json.dumps({
+        "scenes": args.scenes,
+        "edited_scenes": 1,
+        "render_profile": args.render_profile,
+        "first_job": first,
+        "full_rerender": full,
+        "incremental_rerender": incremental,
+        "speedup": round(full["latency_s"] / incremental["latency_s"], 2),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
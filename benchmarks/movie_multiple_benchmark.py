@@ -0,0 +1,75 @@
+"""
+Wall-clock time of rendering /movie/combine-video-and-audio-multiple-concatenate items
+one at a time versus in parallel under the shared render limit, for 2, 4 and 8 items.
+
+Input videos are made once from the example/images fixtures; narration uses example/audios
+with captions timed from the known text, so neither TTS nor Whisper is part of the numbers.
+
+Usage: python -m benchmarks.movie_multiple_benchmark
+"""
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import ffmpeg
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import movie
+from app.utils import caption_alignment, ffmpeg_scene
+from benchmarks.parallel_render_benchmark import EXAMPLE_TEXTS, EXAMPLE_IMAGES, EXAMPLE_AUDIOS
+
+ITEM_COUNTS = (2, 4, 8)
+
+def make_input_video(image_path: str, duration: float, output_path: str, width: int, height: int) -> str:
+    (
+        ffmpeg
+        .input(image_path, loop=1, t=duration)
+        .output(output_path, vcodec="libx264", pix_fmt="yuv420p", r=24, vf=f"scale={width}:{height}")
+        .run(overwrite_output=True, quiet=True)
+    )
+    return output_path
+
+def build_items(fixture_dir: str) -> list:
+    items = []
+    for index, (image, audio, text) in enumerate(zip(EXAMPLE_IMAGES, EXAMPLE_AUDIOS, EXAMPLE_TEXTS)):
+        duration = ffmpeg_scene.probe_duration(audio)
+        background = make_input_video(image, duration, os.path.join(fixture_dir, f"{index}-background.mp4"), 1280, 720)
+        overlay = make_input_video(image, duration, os.path.join(fixture_dir, f"{index}-overlay.mp4"), 640, 360)
+        items.append((background, overlay, audio, caption_alignment.align_from_source(audio, text)))
+    return items
+
+async def measure(fixtures: list, output_dir: str) -> dict:
+    # One Event Loop For Every Run, The Shared Render Semaphore Is Bound To The First Loop That Uses It
+    results = {}
+    for item_count in ITEM_COUNTS:
+        items = [fixtures[index % len(fixtures)] for index in range(item_count)]
+
+        start = perf_counter()
+        sequential_outputs = [movie.render_uploaded_item(*item, os.path.join(output_dir, f"sequential-{index}.mp4")) for index, item in enumerate(items)]
+        sequential = perf_counter() - start
+
+        start = perf_counter()
+        parallel_outputs = await asyncio.gather(*[movie.run_render_limited(movie.render_uploaded_item, *item, os.path.join(output_dir, f"parallel-{index}.mp4")) for index, item in enumerate(items)])
+        parallel = perf_counter() - start
+
+        for output_path in sequential_outputs + list(parallel_outputs):
+            os.remove(output_path)
+        results[item_count] = {
+            "sequential_s": round(sequential, 2),
+            "parallel_s": round(parallel, 2),
+            "speedup": round(sequential / parallel, 2),
+        }
+    return results
+
+def main():
+    report = { "render_concurrency": movie.get_render_concurrency(), "executor": movie.get_render_executor() }
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        report["items"] = asyncio.run(measure(build_items(fixture_dir), fixture_dir))
+    movie.shutdown_render_pool()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Wall-clock time of rendering a 6-scene job sequentially versus in the render process pool.
+
+Uses the example/images and example/audios fixtures; captions are timed from the known
+scene text so Whisper does not skew the numbers.
+
+Usage: python -m benchmarks.parallel_render_benchmark
+"""
+import os
+import sys
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import movie
+from app.utils import caption_alignment
+
+EXAMPLE_TEXTS = [
+    "A golden retriever named Max bounds through a sunlit park, his fur glistening against the emerald grass. He chases a fluttering butterfly, paws kicking up clumps of dirt, embodying pure joy.",
+    "In a cozy living room, a scruffy terrier curls up on a worn-out sofa, head resting on a human's lap. The gentle sound of a heartbeat lulls him to sleep as the owner strokes his fur absentmindedly.",
+    "Rain pours down as a black Labrador splashes through puddles, droplets flying everywhere. He shakes off the water, grinning, as his owner laughs, holding a bright yellow umbrella.",
+    "A timid beagle hides behind the legs of a little girl at the dog park. Encouraged by gentle pats, he gradually steps forward, sniffing at the grass, drawn to a wagging tail nearby.",
+    "Under a starry night, a shepherd sits beside his owner on a porch swing, gazing up in silence. The moonlight casts a serene glow, illuminating the unshakeable bond between them.",
+    "A group of puppies tumble over each other in a playful frenzy, their barks echoing in the air. Each one competes for the attention of a child, who giggles as they nuzzle and lick her hands.",
+]
+EXAMPLE_IMAGES = [os.path.join("example", "images", f"JOB_ID_{index}_scene.png") for index in range(6)]
+EXAMPLE_AUDIOS = [os.path.join("example", "audios", f"{index}-speech.mp3") for index in range(6)]
+
+def build_render_args():
+    return [
+        (1920, 1080, "image", image, audio, caption_alignment.align_from_source(audio, text), 30, "white")
+        for image, audio, text in zip(EXAMPLE_IMAGES, EXAMPLE_AUDIOS, EXAMPLE_TEXTS)
+    ]
+
+def main():
+    all_render_args = build_render_args()
+    workers = movie.get_render_concurrency()
+
+    start = perf_counter()
+    sequential_outputs = [movie.render_scene_clip(*render_args) for render_args in all_render_args]
+    sequential = perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=movie.init_render_worker) as pool:
+        # Warm The Workers So Process Start-Up And Imports Are Not Counted As Render Time, The Initializer Imports MoviePy
+        list(pool.map(movie.render_worker_ready, range(workers)))
+        start = perf_counter()
+        parallel_outputs = list(pool.map(movie.render_scene_clip, *zip(*all_render_args)))
+        parallel = perf_counter() - start
+
+    for output_path in sequential_outputs + parallel_outputs:
+        os.remove(output_path)
+
+    print(json.dumps({
+        "scenes": len(all_render_args),
+        "workers": workers,
+        "sequential_s": round(sequential, 2),
+        "process_pool_s": round(parallel, 2),
+        "speedup": round(sequential / parallel, 2),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
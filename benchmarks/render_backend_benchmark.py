@@ -0,0 +1,38 @@
+"""
+Per-scene render throughput of the MoviePy backend versus the ffmpeg filtergraph backend.
+
+Usage: python -m benchmarks.render_backend_benchmark
+"""
+import os
+import sys
+import json
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import movie
+from app.utils import ffmpeg_scene
+from benchmarks.parallel_render_benchmark import build_render_args
+
+def main():
+    all_render_args = build_render_args()
+    report = { "scenes": len(all_render_args) }
+    for backend, render_function in movie.RENDER_BACKENDS.items():
+        scene_times = []
+        scene_seconds = 0.0
+        for render_args in all_render_args:
+            start = perf_counter()
+            output_path = render_function(*render_args)
+            scene_times.append(perf_counter() - start)
+            scene_seconds += ffmpeg_scene.probe_duration(output_path)
+            os.remove(output_path)
+        report[backend] = {
+            "per_scene_s": [round(value, 2) for value in scene_times],
+            "total_s": round(sum(scene_times), 2),
+            "video_seconds_per_wall_second": round(scene_seconds / sum(scene_times), 2),
+        }
+    report["speedup"] = round(report[movie.RENDER_BACKEND_MOVIEPY]["total_s"] / report[movie.RENDER_BACKEND_FFMPEG]["total_s"], 2)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Wall time and output size of rendering the example scenes with each render profile,
+with the same captions and timeline, and the speedup of every profile over "standard".
+
+Usage: python -m benchmarks.render_profile_benchmark [--backend moviepy|ffmpeg] [--orientation landscape|portrait|square]
+"""
+import os
+import sys
+import json
+import argparse
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import movie
+from app.utils import render_profiles
+from benchmarks.parallel_render_benchmark import build_render_args
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default=movie.RENDER_BACKEND_MOVIEPY, choices=list(movie.RENDER_BACKENDS))
+    parser.add_argument("--orientation", default=render_profiles.DEFAULT_ORIENTATION, choices=render_profiles.ORIENTATIONS)
+    args = parser.parse_args()
+
+    render_function = movie.RENDER_BACKENDS[args.backend]
+    all_render_args = build_render_args()
+    report = { "scenes": len(all_render_args), "backend": args.backend, "orientation": args.orientation }
+    for name in render_profiles.PROFILES:
+        profile = render_profiles.resolve(name, args.orientation)
+        start = perf_counter()
+        all_video_path = [render_function(profile["width"], profile["height"], *render_args[2:], movie.workspace.OUTPUT_DIR, profile) for render_args in all_render_args]
+        render_time = perf_counter() - start
+        report[name] = {
+            "size": f"{profile['width']}x{profile['height']}",
+            "fps": profile["fps"],
+            "total_s": round(render_time, 2),
+            "output_bytes": sum(os.path.getsize(video_path) for video_path in all_video_path),
+        }
+        for video_path in all_video_path:
+            os.remove(video_path)
+    for name in render_profiles.PROFILES:
+        report[name]["speedup_over_standard"] = round(report["standard"]["total_s"] / report[name]["total_s"], 2)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
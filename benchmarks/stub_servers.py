@@ -0,0 +1,129 @@
+"""
+Local stand-ins for the OpenAI chat completions, Pixabay image/video search and Kokoro speech APIs,
+serving the example/images and example/audios fixtures (as mp3 or, when asked for, WAV). Used by benchmarks.e2e_benchmark.
+
+Usage: python -m benchmarks.stub_servers [port]
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import ffmpeg
+import uvicorn
+from time import time
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.parallel_render_benchmark import EXAMPLE_TEXTS, EXAMPLE_IMAGES, EXAMPLE_AUDIOS
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PORT = 8990
+SEARCH_HITS = 20
+STUB_VIDEO_SECONDS = 15
+STUB_VIDEO_PATH = os.path.join("cache", "stubs", "stub-video.mp4")
+STUB_AUDIO_DIR = os.path.join("cache", "stubs", "audios")
+# Kokoro's Output Rate
+STUB_AUDIO_SAMPLE_RATE = 24000
+
+app = FastAPI(title="Benchmark API Stubs")
+
+def _pick(items: list, key: str):
+    return items[int(hashlib.sha256(key.encode()).hexdigest(), 16) % len(items)]
+
+def _completion(model: str, content: str) -> dict:
+    return {
+        "id": f"chatcmpl-stub-{int(time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time()),
+        "model": model,
+        "choices": [{ "index": 0, "message": { "role": "assistant", "content": content }, "finish_reason": "stop" }],
+        "usage": { "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0 },
+    }
+
+def _text(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content)
+    return content or ""
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    user_text = _text(body["messages"][-1])
+    if body.get("response_format", {}).get("type") == "json_object":
+        # Batched Search Queries: One Per Numbered Scene
+        scene_count = len(re.findall(r"^\d+\. ", user_text, flags=re.MULTILINE))
+        return _completion(body["model"], json.dumps({ "queries": ["dog park"] * scene_count }))
+    scene_request = re.match(r"Write (\d+) short scene descriptions", user_text)
+    if scene_request:
+        scenes = [EXAMPLE_TEXTS[index % len(EXAMPLE_TEXTS)] for index in range(int(scene_request.group(1)))]
+        return _completion(body["model"], "\n\n".join(scenes))
+    return _completion(body["model"], "dog park")
+
+def _hits(request: Request, query: str) -> list:
+    base_url = str(request.base_url).rstrip("/")
+    # Distinct URLs Per Query, So Asset Caching Behaves As It Would Against Pixabay
+    return [
+        { "id": index, "webformatURL": f"{base_url}/files/images/{index % len(EXAMPLE_IMAGES)}.png?q={hashlib.sha256(query.encode()).hexdigest()[:8]}&i={index}" }
+        for index in range(SEARCH_HITS)
+    ]
+
+@app.get("/pixabay/")
+async def pixabay_images(request: Request, q: str = ""):
+    return { "total": SEARCH_HITS, "totalHits": SEARCH_HITS, "hits": _hits(request, q) }
+
+@app.get("/pixabay/videos/")
+async def pixabay_videos(request: Request, q: str = ""):
+    base_url = str(request.base_url).rstrip("/")
+    hits = [{ "id": index, "duration": STUB_VIDEO_SECONDS, "videos": { "large": { "url": f"{base_url}/files/video.mp4?q={hashlib.sha256(q.encode()).hexdigest()[:8]}&i={index}" } } } for index in range(SEARCH_HITS)]
+    return { "total": SEARCH_HITS, "totalHits": SEARCH_HITS, "hits": hits }
+
+@app.get("/files/images/{index}.png")
+async def image_file(index: int):
+    return FileResponse(os.path.join(ROOT_DIR, EXAMPLE_IMAGES[index % len(EXAMPLE_IMAGES)]), media_type="image/png")
+
+@app.get("/files/video.mp4")
+async def video_file():
+    return FileResponse(ensure_stub_video(), media_type="video/mp4")
+
+@app.post("/v1/audio/speech")
+async def speech(request: Request):
+    body = await request.json()
+    audio_path = os.path.join(ROOT_DIR, _pick(EXAMPLE_AUDIOS, body.get("input", "")))
+    if body.get("response_format") == "wav":
+        return FileResponse(ensure_stub_wav(audio_path), media_type="audio/wav")
+    return FileResponse(audio_path, media_type="audio/mpeg")
+
+def ensure_stub_wav(audio_path: str) -> str:
+    """The example narration as 16 bit mono WAV, as Kokoro answers for response_format wav."""
+    path = os.path.join(ROOT_DIR, STUB_AUDIO_DIR, f"{os.path.splitext(os.path.basename(audio_path))[0]}.wav")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp.wav"
+        ffmpeg.input(audio_path).output(temp_path, acodec="pcm_s16le", ac=1, ar=STUB_AUDIO_SAMPLE_RATE).run(overwrite_output=True, quiet=True)
+        os.replace(temp_path, path)
+    return path
+
+def ensure_stub_video() -> str:
+    """A 15 second clip made once from the first example image, long enough for the 10-20s video filter."""
+    path = os.path.join(ROOT_DIR, STUB_VIDEO_PATH)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        (
+            ffmpeg
+            .input(os.path.join(ROOT_DIR, EXAMPLE_IMAGES[0]), loop=1, t=STUB_VIDEO_SECONDS)
+            .output(path, vcodec="libx264", pix_fmt="yuv420p", r=24, vf="scale=1280:720")
+            .run(overwrite_output=True, quiet=True)
+        )
+    return path
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    ensure_stub_video()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
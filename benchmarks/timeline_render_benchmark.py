@@ -0,0 +1,50 @@
+"""
+Wall time and bytes written for the segments render path versus the single-pass timeline.
+
+Usage: python -m benchmarks.timeline_render_benchmark
+"""
+import os
+import sys
+import json
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import movie, generate_ai
+from app.utils import render_profiles
+from benchmarks.parallel_render_benchmark import build_render_args
+
+def main():
+    all_render_args = build_render_args()
+    os.makedirs("temp_videos", exist_ok=True)
+
+    # Segments: Encode Every Scene, Decode Them Again And Encode The Concatenation
+    start = perf_counter()
+    all_video_path = [movie.render_scene_clip(*render_args) for render_args in all_render_args]
+    segments_output = os.path.join("temp_videos", "benchmark-segments.mp4")
+    generate_ai.write_final_video(all_video_path, segments_output, render_profiles.resolve())
+    segments_time = perf_counter() - start
+    intermediate_bytes = sum(os.path.getsize(video_path) for video_path in all_video_path)
+    segments_bytes = intermediate_bytes + os.path.getsize(segments_output)
+
+    # Timeline: One Composition, One Encode, No Intermediate Files
+    start = perf_counter()
+    timeline_output = movie.render_timeline(all_render_args, os.path.join("temp_videos", "benchmark-timeline.mp4"))
+    timeline_time = perf_counter() - start
+    timeline_bytes = os.path.getsize(timeline_output)
+
+    for video_path in [*all_video_path, segments_output, timeline_output]:
+        os.remove(video_path)
+
+    print(json.dumps({
+        "scenes": len(all_render_args),
+        "segments_s": round(segments_time, 2),
+        "timeline_s": round(timeline_time, 2),
+        "wall_time_saved_s": round(segments_time - timeline_time, 2),
+        "segments_bytes_written": segments_bytes,
+        "timeline_bytes_written": timeline_bytes,
+        "intermediate_bytes_saved": intermediate_bytes,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
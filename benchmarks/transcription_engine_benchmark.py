@@ -0,0 +1,104 @@
+"""
+Accuracy and real-time factor of every transcription engine on the example audios.
+
+Word error rate is measured against the scene text the audios were synthesized from, and
+word timings of every engine are compared with openai-whisper's on the words both recognized.
+Real-time factor is transcription time divided by audio duration, lower is faster.
+
+Usage: python -m benchmarks.transcription_engine_benchmark [--engines openai-whisper faster-whisper] [--threads 4]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from difflib import SequenceMatcher
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import whisper_model, ffmpeg_scene
+from benchmarks.parallel_render_benchmark import EXAMPLE_TEXTS, EXAMPLE_AUDIOS
+
+def normalize_words(text: str) -> list:
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+def word_error_rate(reference: list, hypothesis: list) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    previous = list(range(len(hypothesis) + 1))
+    for index, reference_word in enumerate(reference, 1):
+        current = [index]
+        for hypothesis_index, hypothesis_word in enumerate(hypothesis, 1):
+            current.append(min(previous[hypothesis_index] + 1, current[-1] + 1, previous[hypothesis_index - 1] + (reference_word != hypothesis_word)))
+        previous = current
+    return previous[-1] / max(1, len(reference))
+
+def timed_words(transcription: dict) -> list:
+    return [
+        (normalized[0], word["start"])
+        for segment in transcription["segments"] for word in segment.get("words", [])
+        for normalized in [normalize_words(word["word"])] if normalized
+    ]
+
+def timing_offset(baseline: dict, transcription: dict) -> float:
+    """Mean absolute start time difference of the words both transcriptions recognized, in seconds."""
+    baseline_words, words = timed_words(baseline), timed_words(transcription)
+    matcher = SequenceMatcher(a=[word for word, _ in baseline_words], b=[word for word, _ in words], autojunk=False)
+    offsets = [
+        abs(baseline_words[block.a + index][1] - words[block.b + index][1])
+        for block in matcher.get_matching_blocks() for index in range(block.size)
+    ]
+    return sum(offsets) / len(offsets) if offsets else 0.0
+
+def measure(engine: str) -> dict:
+    engine_functions = whisper_model.ENGINES[engine]
+    start = perf_counter()
+    try:
+        model = engine_functions["load"](whisper_model.get_model_name())
+    except (ImportError, RuntimeError) as e:
+        return { "error": str(e) }
+    load_time = perf_counter() - start
+    transcriptions, transcribe_times, error_rates = [], [], []
+    for audio_file, text in zip(EXAMPLE_AUDIOS, EXAMPLE_TEXTS):
+        start = perf_counter()
+        transcription = engine_functions["transcribe"](model, audio_file)
+        transcribe_times.append(perf_counter() - start)
+        transcriptions.append(transcription)
+        error_rates.append(word_error_rate(normalize_words(text), normalize_words(transcription["text"])))
+    return {
+        "load_s": round(load_time, 3),
+        "transcribe_s": round(sum(transcribe_times), 3),
+        "per_audio_s": [round(value, 3) for value in transcribe_times],
+        "word_error_rate": round(sum(error_rates) / len(error_rates), 4),
+        "transcriptions": transcriptions,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", default=list(whisper_model.ENGINES), choices=list(whisper_model.ENGINES))
+    parser.add_argument("--threads", type=int, default=None, help="Sets TRANSCRIPTION_THREADS for every engine")
+    args = parser.parse_args()
+    if args.threads is not None:
+        os.environ["TRANSCRIPTION_THREADS"] = str(args.threads)
+
+    audio_seconds = sum(ffmpeg_scene.probe_duration(audio_file) for audio_file in EXAMPLE_AUDIOS)
+    results = { engine: measure(engine) for engine in args.engines }
+    baseline = results.get(whisper_model.ENGINE_OPENAI_WHISPER, {}).get("transcriptions")
+    report = {
+        "model": whisper_model.get_model_name(),
+        "compute_type": whisper_model.get_compute_type(),
+        "threads": whisper_model.get_thread_count(),
+        "audios": len(EXAMPLE_AUDIOS),
+        "audio_s": round(audio_seconds, 2),
+    }
+    for engine, result in results.items():
+        transcriptions = result.pop("transcriptions", None)
+        if transcriptions is not None:
+            result["real_time_factor"] = round(result["transcribe_s"] / audio_seconds, 4)
+            if baseline is not None and engine != whisper_model.ENGINE_OPENAI_WHISPER:
+                result["word_timing_offset_s"] = round(sum(timing_offset(base, other) for base, other in zip(baseline, transcriptions)) / len(transcriptions), 4)
+        report[engine] = result
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-scene transcription latency before and after the shared Whisper model registry.
+
+Usage: python -m benchmarks.whisper_registry_benchmark
+"""
+import os
+import sys
+import json
+import whisper
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import whisper_model
+
+EXAMPLE_AUDIOS = [os.path.join("example", "audios", f"{index}-speech.mp3") for index in range(6)]
+
+def transcribe_with_fresh_model(audio_file: str):
+    """Old behaviour: every scene loads and deserializes the model again."""
+    model = whisper.load_model(whisper_model.get_model_name())
+    return model.transcribe(audio_file, word_timestamps=True)
+
+def main():
+    before = []
+    for audio_file in EXAMPLE_AUDIOS:
+        start = perf_counter()
+        transcribe_with_fresh_model(audio_file)
+        before.append(perf_counter() - start)
+
+    # Registry Load Is Paid Once, At Startup In The App
+    start = perf_counter()
+    whisper_model.get_whisper_model()
+    load_time = perf_counter() - start
+
+    after = []
+    for audio_file in EXAMPLE_AUDIOS:
+        start = perf_counter()
+        whisper_model.transcribe_audio_files([audio_file])
+        after.append(perf_counter() - start)
+
+    start = perf_counter()
+    whisper_model.transcribe_audio_batches([[audio_file] for audio_file in EXAMPLE_AUDIOS])
+    batched = perf_counter() - start
+
+    report = {
+        "model": whisper_model.get_model_name(),
+        "scenes": len(EXAMPLE_AUDIOS),
+        "per_scene_before_s": [round(value, 3) for value in before],
+        "per_scene_after_s": [round(value, 3) for value in after],
+        "mean_before_s": round(sum(before) / len(before), 3),
+        "mean_after_s": round(sum(after) / len(after), 3),
+        "registry_load_s": round(load_time, 3),
+        "batched_job_s": round(batched, 3),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()